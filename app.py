@@ -4,10 +4,6 @@ Home page: yesterday's snapshot + month-to-date metrics + daily sales chart.
 """
 
 import streamlit as st
-import pandas as pd
-from datetime import datetime, timedelta
-from zoneinfo import ZoneInfo
-from utils.sheets import get_spreadsheet
 from utils.auth import require_auth
 
 st.set_page_config(
@@ -18,121 +14,45 @@ st.set_page_config(
 
 require_auth("business")
 
-# ─── PWA + branding meta tags ──────────────────────────────────────────────────
+# Heavy imports only once authenticated — the login screen renders without
+# paying for pandas / numpy / pyarrow on a cold worker.
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+import pyarrow.compute as pc
+import time
+from datetime import date, datetime
+from itertools import zip_longest
+from pathlib import Path
+from zoneinfo import ZoneInfo
+from utils.sheets import get_revision_id, get_sheets_batch, values_to_frame
+from utils.disk_cache import read_frame, write_frame, clear_frames
 
-st.markdown("""
+# ─── PWA meta tags + global CSS ───────────────────────────────────────────────
+
+_PWA_HEAD = """
 <link rel="manifest"         href="/app/static/manifest.json">
 <link rel="apple-touch-icon" href="/app/static/icon-192.png">
 <meta name="apple-mobile-web-app-capable"          content="yes">
 <meta name="apple-mobile-web-app-status-bar-style" content="black-translucent">
 <meta name="apple-mobile-web-app-title"            content="Loeppky">
 <meta name="theme-color"                           content="#2d6a9f">
-""", unsafe_allow_html=True)
-
-# ─── Global CSS ───────────────────────────────────────────────────────────────
-
-st.markdown("""
-<style>
-/* ── Metric cards ── */
-[data-testid="metric-container"] {
-    background: #1a1f2e;
-    border: 1px solid rgba(45, 106, 159, 0.35);
-    border-radius: 10px;
-    padding: 18px 16px 14px 16px;
-    box-shadow: 0 2px 10px rgba(0,0,0,0.35);
-}
-[data-testid="stMetricValue"] > div {
-    font-size: 1.65rem !important;
-    font-weight: 700 !important;
-}
-[data-testid="stMetricLabel"] > div {
-    font-size: 0.78rem !important;
-    text-transform: uppercase;
-    letter-spacing: 0.06em;
-    color: #8899aa !important;
-}
-
-/* ── Buttons ── */
-.stButton > button {
-    border-radius: 8px !important;
-    font-weight: 600 !important;
-    letter-spacing: 0.02em;
-    transition: all 0.15s ease !important;
-}
-.stButton > button[kind="primary"] {
-    background: #2d6a9f !important;
-    border: none !important;
-}
-.stButton > button:hover {
-    filter: brightness(1.15) !important;
-    box-shadow: 0 4px 12px rgba(45,106,159,0.4) !important;
-}
-
-/* ── Sidebar branding ── */
-[data-testid="stSidebar"] > div:first-child {
-    padding-top: 0 !important;
-}
-.sidebar-brand {
-    background: linear-gradient(160deg, #12172a 0%, #1a2540 100%);
-    border-bottom: 2px solid #c89b37;
-    padding: 18px 20px 14px 20px;
-    margin: -1rem -1rem 1rem -1rem;
-}
-.sidebar-brand .brand-name {
-    font-size: 1.25rem;
-    font-weight: 800;
-    color: #c89b37;
-    letter-spacing: 0.04em;
-}
-.sidebar-brand .brand-sub {
-    font-size: 0.72rem;
-    color: #6a7f99;
-    margin-top: 2px;
-    text-transform: uppercase;
-    letter-spacing: 0.08em;
-}
-
-/* ── Dividers ── */
-hr {
-    border-color: rgba(255,255,255,0.08) !important;
-    margin: 1.2rem 0 !important;
-}
-
-/* ── Dataframe ── */
-[data-testid="stDataFrame"] {
-    border-radius: 10px !important;
-    overflow: hidden;
-    border: 1px solid rgba(45, 106, 159, 0.2) !important;
-}
-
-/* ── Section labels ── */
-.section-label {
-    font-size: 0.72rem;
-    font-weight: 700;
-    text-transform: uppercase;
-    letter-spacing: 0.1em;
-    color: #2d6a9f;
-    margin-bottom: 0.5rem;
-}
-
-/* ── Nav card grid ── */
-.nav-card {
-    background: #1a1f2e;
-    border: 1px solid rgba(45,106,159,0.25);
-    border-radius: 10px;
-    padding: 14px 16px;
-    margin-bottom: 8px;
-    cursor: pointer;
-    transition: border-color 0.15s ease;
-}
-.nav-card:hover {
-    border-color: #2d6a9f;
-}
-.nav-card .nav-icon { font-size: 1.4rem; }
-.nav-card .nav-title { font-weight: 600; font-size: 0.9rem; margin-top: 4px; }
-.nav-card .nav-desc  { font-size: 0.75rem; color: #6a7f99; margin-top: 2px; }
-</style>
-""", unsafe_allow_html=True)
+"""
+
+
+@st.cache_resource
+def _head_html() -> str:
+    """
+    PWA tags + static/app.css, read from disk once per process.
+    Streamlit's static server sends .css as text/plain (browsers refuse it as a
+    stylesheet), and elements not re-sent on a rerun are removed — so the
+    cached string is emitted as a single element on every run.
+    """
+    css = (Path(__file__).parent / "static" / "app.css").read_text(encoding="utf-8")
+    return f"{_PWA_HEAD}<style>\n{css}</style>"
+
+
+st.markdown(_head_html(), unsafe_allow_html=True)
 
 # ─── Sidebar branding ─────────────────────────────────────────────────────────
 
@@ -150,58 +70,208 @@ TIMEZONE = ZoneInfo("America/Edmonton")
 now = datetime.now(TIMEZONE)
 
 
-@st.cache_data(ttl=300)
-def load_amazon_data() -> pd.DataFrame:
-    ws = get_spreadsheet().worksheet("📊 Amazon 2026")
-    data = ws.get_all_records()
-    if not data:
+@st.cache_resource(max_entries=2)
+def _clock_keys(today: date) -> dict:
+    """
+    Every date boundary the page filters on, as datetime64[D] scalars.
+    Keyed on the calendar day, so the date arithmetic runs once a day instead
+    of on every rerun.
+    """
+    d           = np.datetime64(today, "D")
+    month       = d.astype("datetime64[M]")
+    month_first = month.astype("datetime64[D]")
+    prev_first  = (month - 1).astype("datetime64[D]")
+    year        = d.astype("datetime64[Y]")
+    return {
+        "today":      d,
+        "yesterday":  d - 1,
+        "month":      (month_first, (month + 1).astype("datetime64[D]") - 1),
+        "week":       (d - 6, None),
+        "prior_week": (d - 13, d - 7),
+        # Same day-span of last month, clamped to that month's length
+        "prior_mtd":  (prev_first, min(prev_first + (d - month_first), month_first - 1)),
+        "year":       (year.astype("datetime64[D]"), (year + 1).astype("datetime64[D]") - 1),
+    }
+
+
+AMAZON_SHEET    = "📊 Amazon 2026"
+INVENTORY_SHEET = "📦 Book Inventory"
+
+_NUMERIC_COLS = ["SalesOrganic", "UnitsOrganic", "Orders", "AmazonFees",
+                 "Refunds", "EstimatedPayout", "GrossProfit"]
+
+# Columns summed for every metric block — reduced together in one pass
+_TOTAL_COLS = ["SalesOrganic", "EstimatedPayout", "UnitsOrganic", "Orders", "GrossProfit"]
+
+# Cells Arrow can cast to a number; anything else is treated as 0
+_NUM_RE = r"^[-+]?(\d+\.?\d*|\.\d+)([eE][-+]?\d+)?$"
+_INT_RE = r"^[-+]?\d+$"
+
+
+def _arrow_numeric(arr: pa.Array) -> pa.Array:
+    """
+    Coerce a string column to numbers with Arrow's native cast kernels —
+    non-numeric cells become 0. Stays int64 when every cell is an integer,
+    matching what pd.to_numeric used to produce.
+    """
+    arr = pc.utf8_trim_whitespace(arr)
+    arr = pc.if_else(pc.match_substring_regex(arr, _NUM_RE), arr, pa.scalar(None, pa.string()))
+    if arr.null_count == 0 and pc.all(pc.match_substring_regex(arr, _INT_RE)).as_py() is not False:
+        return pc.cast(arr, pa.int64())
+    return pc.fill_null(pc.cast(arr, pa.float64()), 0.0)
+
+
+def _parse_amazon(values: list[list[str]]) -> pd.DataFrame:
+    """
+    Turn the raw Amazon tab values into a typed, date-sorted frame.
+    Rows are transposed once into Arrow string columns; numeric columns are
+    converted with Arrow compute — no per-row dicts, no object-dtype frame.
+    """
+    if not values or "Date" not in values[0]:
         return pd.DataFrame()
-    df = pd.DataFrame(data)
-    df["Date"] = pd.to_datetime(df["Date"], format="%d/%m/%Y", errors="coerce")
-    df = df.dropna(subset=["Date"]).sort_values("Date")
-    for col in ["SalesOrganic", "UnitsOrganic", "Orders", "AmazonFees",
-                "Refunds", "EstimatedPayout", "GrossProfit"]:
-        if col in df.columns:
-            df[col] = pd.to_numeric(df[col], errors="coerce").fillna(0)
+    header, rows = values[0], values[1:]
+    cols  = list(zip_longest(*rows, fillvalue=""))[:len(header)]
+    cols += [("",) * len(rows)] * (len(header) - len(cols))
+
+    dates = pd.to_datetime(np.asarray(cols[header.index("Date")], dtype=object),
+                           format="%d/%m/%Y", errors="coerce")
+    valid = np.asarray(dates.notna())  # drop non-date rows before coercing
+    keep  = pa.array(valid)
+
+    data = {}
+    for name, col in zip(header, cols):
+        if name == "Date":
+            data[name] = pa.array(dates[valid].to_numpy())
+            continue
+        arr = pa.array(col, type=pa.string()).filter(keep)
+        data[name] = _arrow_numeric(arr) if name in _NUMERIC_COLS else arr
+
+    # Arrow-backed dtypes end-to-end: st.dataframe / st.line_chart ship these
+    # buffers as-is instead of converting numpy columns to Arrow on every render
+    df = pa.table(data).to_pandas(types_mapper=pd.ArrowDtype).sort_values("Date")
+    return _with_day_key(df)
+
+
+def _with_day_key(df: pd.DataFrame) -> pd.DataFrame:
+    """Add _d, the day key as numpy datetime64 — the sorted lookup array for _date_slice()."""
+    df["_d"] = df["Date"].to_numpy(dtype="datetime64[ns]").astype("datetime64[D]")
     return df
 
 
-@st.cache_data(ttl=300)
-def load_inventory_counts() -> tuple[int, int]:
-    try:
-        ws   = get_spreadsheet().worksheet("📦 Book Inventory")
-        data = ws.get_all_records()
-        if not data:
-            return 0, 0
-        df = pd.DataFrame(data)
-        if "Status" not in df.columns:
-            return len(df), 0
-        return int((df["Status"] == "Unlisted").sum()), int((df["Status"] == "Listed").sum())
-    except Exception:
-        return 0, 0
+def _restore_dtypes(df: pd.DataFrame) -> pd.DataFrame:
+    """
+    Give a frame read back from the Parquet cache the dtypes _parse_amazon
+    produces — Arrow-backed columns with text as pa.string(), plus a freshly
+    derived _d — so cold parses and warm disk hits look the same downstream.
+    """
+    if "Date" not in df.columns:
+        return df
+    table = pa.Table.from_pandas(df.drop(columns="_d", errors="ignore"), preserve_index=False)
+    table = table.cast(pa.schema([
+        pa.field(f.name, pa.string()) if pa.types.is_large_string(f.type) else f
+        for f in table.schema
+    ]))
+    return _with_day_key(table.to_pandas(types_mapper=pd.ArrowDtype).set_axis(df.index))
+
+
+def load_all(revision: str) -> tuple[pd.DataFrame, int, int]:
+    """
+    Fetch the Amazon and inventory tabs in one values.batchGet round-trip.
+    Returns (amazon_df, unlisted_count, listed_count).
+    A Parquet copy on local disk, tagged with the sheet revision, skips gspread
+    entirely on warm starts after a worker restart.
+    """
+    df     = read_frame("amazon_2026", ttl=None, tag=revision)
+    counts = read_frame("inventory_counts", ttl=None, tag=revision)
+    if df is not None and counts is not None:
+        return _restore_dtypes(df), int(counts.at[0, "Unlisted"]), int(counts.at[0, "Listed"])
+
+    amazon_vals, inventory_vals = get_sheets_batch([AMAZON_SHEET, INVENTORY_SHEET])
+
+    df = _parse_amazon(amazon_vals)
+
+    inv = values_to_frame(inventory_vals)
+    if "Status" not in inv.columns:
+        unlisted, listed = len(inv), 0
+    else:
+        # One pass over int8 category codes instead of two string comparisons
+        counts   = inv["Status"].astype("category").value_counts()
+        unlisted = int(counts.get("Unlisted", 0))
+        listed   = int(counts.get("Listed", 0))
+
+    write_frame("amazon_2026", df, tag=revision)
+    write_frame("inventory_counts", pd.DataFrame({"Unlisted": [unlisted], "Listed": [listed]}),
+                tag=revision)
+    return df, unlisted, listed
+
+
+@st.cache_resource(max_entries=1)
+def _dashboard_store(revision: str) -> dict:
+    """
+    Process-wide singleton holding the parsed dashboard data.
+    cache_resource hands back the same objects on every rerun — no pickle/copy
+    like cache_data — so treat df as READ-ONLY: slice or .copy() before mutating.
+    Keyed on the sheet revision: the frame is only rebuilt when the sheet changes.
+    """
+    df, unlisted, listed = load_all(revision)
+    # df is date-sorted, so this array supports binary-search range slicing
+    days  = df["_d"].to_numpy() if not df.empty else np.array([], dtype="datetime64[D]")
+    daily = pd.DataFrame(columns=["Sales (CAD)", "Est. Payout (CAD)"])
+    if not df.empty:
+        # Chart-ready per-day rollup in one pass: segment sums from each day's first row
+        day_keys, starts = np.unique(days, return_index=True)
+        sums  = np.add.reduceat(
+            df[["SalesOrganic", "EstimatedPayout"]].to_numpy(dtype="float64"), starts, axis=0,
+        )
+        daily = pd.DataFrame(sums, index=pd.DatetimeIndex(day_keys, name="Date"),
+                             columns=["Sales (CAD)", "Est. Payout (CAD)"])
+    return {"df": df, "days": days, "daily": daily, "unlisted": unlisted, "listed": listed}
 
 
 # ─── Compute metrics ──────────────────────────────────────────────────────────
 
-df = load_amazon_data()
-unlisted, listed = load_inventory_counts()
-current_month = now.strftime("%Y-%m")
-yesterday     = (now - timedelta(days=1)).date()
+# Fall back to a 5-minute bucket if Drive metadata is unavailable
+_store   = _dashboard_store(get_revision_id() or f"t{int(time.time() // 300)}")
+df       = _store["df"]
+days     = _store["days"]
+daily    = _store["daily"]
+unlisted = _store["unlisted"]
+listed   = _store["listed"]
+clock    = _clock_keys(now.date())
+
+
+def _date_slice(lo, hi=None) -> pd.DataFrame:
+    """Rows with lo <= Date <= hi (hi=None → open-ended) via two searchsorted calls."""
+    i = np.searchsorted(days, np.datetime64(lo, "D"), side="left")
+    j = len(days) if hi is None else np.searchsorted(days, np.datetime64(hi, "D"), side="right")
+    return df.iloc[i:j]
+
+
+def _pct_deltas(curr: list[float], prev: list[float]) -> list[str | None]:
+    """Period-over-period % change for all metric pairs at once (None where prev is 0)."""
+    curr = np.asarray(curr, dtype="float64")
+    prev = np.asarray(prev, dtype="float64")
+    with np.errstate(divide="ignore", invalid="ignore"):
+        pct = np.where(prev != 0, (curr - prev) / prev * 100, np.nan)
+    return [f"{x:+.1f}%" if np.isfinite(x) else None for x in pct]
+
 
 if not df.empty:
-    df_month     = df[df["Date"].dt.strftime("%Y-%m") == current_month]
-    df_yesterday = df[df["Date"].dt.date == yesterday]
-
-    y_sales  = float(df_yesterday["SalesOrganic"].sum())
-    y_payout = float(df_yesterday["EstimatedPayout"].sum())
-    y_units  = int(df_yesterday["UnitsOrganic"].sum())
-    y_orders = int(df_yesterday["Orders"].sum())
-
-    mtd_sales  = float(df_month["SalesOrganic"].sum())
-    mtd_payout = float(df_month["EstimatedPayout"].sum())
-    mtd_units  = int(df_month["UnitsOrganic"].sum())
-    mtd_orders = int(df_month["Orders"].sum())
-    mtd_profit = float(df_month["GrossProfit"].sum())
+    df_month     = _date_slice(*clock["month"])
+    df_yesterday = _date_slice(clock["yesterday"], clock["yesterday"])
+
+    y_tot    = df_yesterday[_TOTAL_COLS].sum()
+    y_sales  = float(y_tot["SalesOrganic"])
+    y_payout = float(y_tot["EstimatedPayout"])
+    y_units  = int(y_tot["UnitsOrganic"])
+    y_orders = int(y_tot["Orders"])
+
+    m_tot      = df_month[_TOTAL_COLS].sum()
+    mtd_sales  = float(m_tot["SalesOrganic"])
+    mtd_payout = float(m_tot["EstimatedPayout"])
+    mtd_units  = int(m_tot["UnitsOrganic"])
+    mtd_orders = int(m_tot["Orders"])
+    mtd_profit = float(m_tot["GrossProfit"])
 else:
     y_sales = y_payout = y_units = y_orders = 0
     mtd_sales = mtd_payout = mtd_units = mtd_orders = mtd_profit = 0
@@ -228,6 +298,8 @@ with col_btn:
     st.write("")
     if st.button("🔄 Refresh", use_container_width=True):
         st.cache_data.clear()
+        _dashboard_store.clear()
+        clear_frames()
         st.rerun()
 
 st.divider()
@@ -235,7 +307,7 @@ st.divider()
 
 # ─── Yesterday ────────────────────────────────────────────────────────────────
 
-st.markdown(f'<div class="section-label">Yesterday — {yesterday.strftime("%B %d")}</div>',
+st.markdown(f'<div class="section-label">Yesterday — {clock["yesterday"].item().strftime("%B %d")}</div>',
             unsafe_allow_html=True)
 c1, c2, c3, c4 = st.columns(4)
 c1.metric("Sales (CAD)",       f"${y_sales:,.2f}")
@@ -262,95 +334,87 @@ st.divider()
 
 # ─── Sales chart with time frame selector ─────────────────────────────────────
 
-today = now.date()
-
-tf_label = st.radio(
-    "Time frame",
-    ["Today", "7 Days", "MTD", "YTD"],
-    index=2,
-    horizontal=True,
-    label_visibility="collapsed",
-)
-
-if not df.empty:
-    if tf_label == "Today":
-        chart_df = df[df["Date"].dt.date == today]
-        prior_df = df[df["Date"].dt.date == yesterday]
-    elif tf_label == "7 Days":
-        chart_df = df[df["Date"].dt.date >= (today - timedelta(days=6))]
-        prior_df = df[
-            (df["Date"].dt.date >= (today - timedelta(days=13))) &
-            (df["Date"].dt.date <= (today - timedelta(days=7)))
-        ]
-    elif tf_label == "MTD":
-        chart_df = df_month
-        _first     = now.replace(day=1).date()
-        _prev_last = _first - timedelta(days=1)
-        _prev_first = _prev_last.replace(day=1)
-        _prev_end  = _prev_last if today.day > _prev_last.day else _prev_first.replace(day=today.day)
-        prior_df = df[
-            (df["Date"].dt.date >= _prev_first) &
-            (df["Date"].dt.date <= _prev_end)
-        ]
-    else:  # YTD
-        chart_df = df[df["Date"].dt.year == now.year]
-        prior_df = pd.DataFrame()  # 2025 data is monthly — skip YTD delta
-else:
-    chart_df = pd.DataFrame()
-    prior_df = pd.DataFrame()
+@st.fragment
+def sales_panel(df: pd.DataFrame, df_month: pd.DataFrame, clock: dict) -> None:
+    """
+    Time-frame radio + metrics + chart. A radio click reruns only this
+    fragment — the header, CSS and MTD cards above are left untouched.
+    """
+    tf_label = st.radio(
+        "Time frame",
+        ["Today", "7 Days", "MTD", "YTD"],
+        index=2,
+        horizontal=True,
+        label_visibility="collapsed",
+    )
+
+    if not df.empty:
+        if tf_label == "Today":
+            chart_df = _date_slice(clock["today"], clock["today"])
+            prior_df = _date_slice(clock["yesterday"], clock["yesterday"])
+        elif tf_label == "7 Days":
+            chart_df = _date_slice(*clock["week"])
+            prior_df = _date_slice(*clock["prior_week"])
+        elif tf_label == "MTD":
+            chart_df = df_month
+            prior_df = _date_slice(*clock["prior_mtd"])
+        else:  # YTD
+            chart_df = _date_slice(*clock["year"])
+            prior_df = pd.DataFrame()  # 2025 data is monthly — skip YTD delta
+    else:
+        chart_df = pd.DataFrame()
+        prior_df = pd.DataFrame()
+
+    st.markdown(f'<div class="section-label">Sales — {tf_label}</div>',
+                unsafe_allow_html=True)
+
+    if not chart_df.empty:
+        c_tot    = chart_df[_TOTAL_COLS].sum()
+        _sales   = float(c_tot["SalesOrganic"])
+        _payout  = float(c_tot["EstimatedPayout"])
+        _units   = int(c_tot["UnitsOrganic"])
+        _orders  = int(c_tot["Orders"])
+        _days    = int((chart_df["SalesOrganic"] > 0).sum())
+        _avg_u   = round(_units / _orders, 2) if _orders > 0 else 0.0
+        _avg_s   = round(_sales / _orders, 2) if _orders > 0 else 0.0
+
+        if not prior_df.empty:
+            p_tot    = prior_df[_TOTAL_COLS].sum()
+            p_sales  = float(p_tot["SalesOrganic"])
+            p_payout = float(p_tot["EstimatedPayout"])
+            p_units  = int(p_tot["UnitsOrganic"])
+            p_orders = int(p_tot["Orders"])
+            p_avg_u  = round(p_units / p_orders, 2) if p_orders > 0 else 0.0
+            p_avg_s  = round(p_sales / p_orders, 2) if p_orders > 0 else 0.0
+            d_sales, d_payout, d_units, d_orders, d_avg_u, d_avg_s = _pct_deltas(
+                [_sales,  _payout,  _units,  _orders,  _avg_u,  _avg_s],
+                [p_sales, p_payout, p_units, p_orders, p_avg_u, p_avg_s],
+            )
+        else:
+            d_sales = d_payout = d_units = d_orders = d_avg_u = d_avg_s = None
+
+        mc1, mc2, mc3, mc4 = st.columns(4)
+        mc1.metric("Sales (CAD)",         f"${_sales:,.2f}",  delta=d_sales)
+        mc2.metric("Est. Payout (CAD)",   f"${_payout:,.2f}", delta=d_payout)
+        mc3.metric("Units Sold",          str(_units),        delta=d_units)
+        mc4.metric("Orders",              str(_orders),       delta=d_orders)
+
+        mc5, mc6, mc7, mc8 = st.columns(4)
+        mc5.metric("Avg Units/Order",       f"{_avg_u:.2f}",    delta=d_avg_u)
+        mc6.metric("Avg Sales/Order (CAD)", f"${_avg_s:,.2f}",  delta=d_avg_s)
+        mc7.metric("Days w/ Sales",         str(_days))
+        mc8.write("")
+
+    if not chart_df.empty:
+        chart = daily.loc[chart_df["_d"].iloc[0]:chart_df["_d"].iloc[-1]]
+        st.line_chart(chart, color=["#2d6a9f", "#c89b37"])
+    elif tf_label == "Today":
+        st.info("Today's data not yet available — updates at 6am daily.")
+    else:
+        st.info(f"No data found for {tf_label}.")
 
-st.markdown(f'<div class="section-label">Sales — {tf_label}</div>',
-            unsafe_allow_html=True)
 
-if not chart_df.empty:
-    _sales   = float(chart_df["SalesOrganic"].sum())
-    _payout  = float(chart_df["EstimatedPayout"].sum())
-    _units   = int(chart_df["UnitsOrganic"].sum())
-    _orders  = int(chart_df["Orders"].sum())
-    _days    = int((chart_df["SalesOrganic"] > 0).sum())
-    _avg_u   = round(_units / _orders, 2) if _orders > 0 else 0.0
-    _avg_s   = round(_sales / _orders, 2) if _orders > 0 else 0.0
-
-    def _dpct(curr, prev):
-        return f"{(curr - prev) / prev * 100:+.1f}%" if prev != 0 else None
-
-    if not prior_df.empty:
-        p_sales  = float(prior_df["SalesOrganic"].sum())
-        p_payout = float(prior_df["EstimatedPayout"].sum())
-        p_units  = int(prior_df["UnitsOrganic"].sum())
-        p_orders = int(prior_df["Orders"].sum())
-        p_avg_u  = round(p_units / p_orders, 2) if p_orders > 0 else 0.0
-        p_avg_s  = round(p_sales / p_orders, 2) if p_orders > 0 else 0.0
-        d_sales  = _dpct(_sales,  p_sales)
-        d_payout = _dpct(_payout, p_payout)
-        d_units  = _dpct(_units,  p_units)
-        d_orders = _dpct(_orders, p_orders)
-        d_avg_u  = _dpct(_avg_u,  p_avg_u)
-        d_avg_s  = _dpct(_avg_s,  p_avg_s)
-    else:
-        d_sales = d_payout = d_units = d_orders = d_avg_u = d_avg_s = None
-
-    mc1, mc2, mc3, mc4 = st.columns(4)
-    mc1.metric("Sales (CAD)",         f"${_sales:,.2f}",  delta=d_sales)
-    mc2.metric("Est. Payout (CAD)",   f"${_payout:,.2f}", delta=d_payout)
-    mc3.metric("Units Sold",          str(_units),        delta=d_units)
-    mc4.metric("Orders",              str(_orders),       delta=d_orders)
-
-    mc5, mc6, mc7, mc8 = st.columns(4)
-    mc5.metric("Avg Units/Order",       f"{_avg_u:.2f}",    delta=d_avg_u)
-    mc6.metric("Avg Sales/Order (CAD)", f"${_avg_s:,.2f}",  delta=d_avg_s)
-    mc7.metric("Days w/ Sales",         str(_days))
-    mc8.write("")
-
-if not chart_df.empty:
-    chart = chart_df[["Date", "SalesOrganic", "EstimatedPayout"]].copy()
-    chart = chart.rename(columns={"SalesOrganic": "Sales (CAD)", "EstimatedPayout": "Est. Payout (CAD)"})
-    chart = chart.set_index("Date")
-    st.line_chart(chart, color=["#2d6a9f", "#c89b37"])
-elif tf_label == "Today":
-    st.info("Today's data not yet available — updates at 6am daily.")
-else:
-    st.info(f"No data found for {tf_label}.")
+sales_panel(df, df_month, clock)
 
 st.divider()
 
@@ -362,16 +426,14 @@ if not df.empty:
     cols = ["Date", "SalesOrganic", "UnitsOrganic", "Orders", "AmazonFees",
             "Refunds", "EstimatedPayout", "GrossProfit"]
     cols   = [c for c in cols if c in df.columns]
-    recent = df[cols].tail(10).copy()
-    recent["Date"] = recent["Date"].dt.strftime("%b %d")
-    recent = recent.iloc[::-1].reset_index(drop=True)
-    recent = recent.rename(columns={
+    recent = df[cols].iloc[-10:][::-1].rename(columns={
         "SalesOrganic":    "Sales",
         "UnitsOrganic":    "Units",
         "AmazonFees":      "Amazon Fees",
         "EstimatedPayout": "Est. Payout",
         "GrossProfit":     "Gross Profit",
     })
+    recent["Date"] = recent["Date"].dt.strftime("%b %d")
     st.dataframe(recent, use_container_width=True, hide_index=True)
 else:
     st.info("No Amazon data loaded yet. Run daily_pl.py or trigger it manually.")
@@ -4,9 +4,11 @@ Visible to admin role only.
 """
 
 import streamlit as st
+import numpy as np
 import pandas as pd
 from utils.auth import require_auth, LOG_SHEET, USERS_SHEET
-from utils.sheets import get_spreadsheet
+from utils.sheets import get_sheets_batch, values_to_frame
+from utils.disk_cache import read_frame, write_frame, clear_frames
 
 st.set_page_config(
     page_title="Admin",
@@ -24,31 +26,59 @@ if st.session_state.get("_auth_role") != "admin":
 st.title("🔧 Admin Panel")
 st.divider()
 
-
-@st.cache_data(ttl=30)
-def _load_sheet(sheet_name: str) -> list[dict]:
+# Users columns that are safe to show and to cache — never the password hash or verify token
+USER_SAFE_COLS = ["Username", "Name", "Email", "Role", "Verified", "Created At"]
+
+
+@st.cache_data(ttl=30, show_spinner=False)
+def _load_sheets() -> tuple[pd.DataFrame, pd.DataFrame]:
+    """
+    Login log and users tabs in a single batchGet round-trip (per tab if that
+    fails, so one unreadable tab doesn't hide the other). The frames are
+    also kept on disk for 30s so a restarted process doesn't refetch them;
+    the users frame is cut to USER_SAFE_COLS before it is cached anywhere.
+    """
+    log, users = read_frame("admin_log", ttl=30), read_frame("admin_users", ttl=30)
+    if log is not None and users is not None:
+        return log, users
+    tabs = [LOG_SHEET, USERS_SHEET]
     try:
-        return get_spreadsheet().worksheet(sheet_name).get_all_records()
+        log_vals, users_vals = get_sheets_batch(tabs)
     except Exception:
-        return []
+        # A missing tab fails the whole batch — read each one on its own
+        per_tab = []
+        for tab in tabs:
+            try:
+                per_tab.append(get_sheets_batch([tab])[0])
+            except Exception:
+                per_tab.append([])
+        log_vals, users_vals = per_tab
+    log, users = values_to_frame(log_vals), values_to_frame(users_vals)
+    users = users[[c for c in USER_SAFE_COLS if c in users.columns]]
+    if "Timestamp" in log.columns:
+        log["Timestamp"] = pd.to_datetime(log["Timestamp"], format="%Y-%m-%d %H:%M:%S", errors="coerce")
+    log = log.astype({c: "category" for c in ("Username", "Action") if c in log.columns})
+    write_frame("admin_log", log)
+    write_frame("admin_users", users)
+    return log, users
 
 
 col_refresh, _ = st.columns([1, 5])
 if col_refresh.button("🔄 Refresh", use_container_width=True):
     st.cache_data.clear()
+    clear_frames()
     st.rerun()
 
 # ── Login Log ──────────────────────────────────────────────────────────────────
 
 st.subheader("📋 Login Activity")
 
-log = _load_sheet(LOG_SHEET)
+log, users_df = _load_sheets()
 
-if not log:
+if log.empty:
     st.info("No login events recorded yet. Events are logged on next sign-in.")
 else:
-    df = pd.DataFrame(log)
-    df.columns = [c.strip() for c in df.columns]
+    df = log
 
     # Filters
     fc1, fc2, fc3 = st.columns(3)
@@ -58,20 +88,24 @@ else:
     action_filt = fc2.selectbox("Action", actions, key="log_action")
     n_rows     = fc3.number_input("Show last N rows (0 = all)", min_value=0, value=50, step=10, key="log_n")
 
-    filtered = df.copy()
+    # One combined mask → one filtered frame (no copy + chained re-filtering)
+    mask = np.ones(len(df), dtype=bool)
     if user_filt != "All":
-        filtered = filtered[filtered["Username"] == user_filt]
+        mask &= (df["Username"] == user_filt).to_numpy()
     if action_filt != "All":
-        filtered = filtered[filtered["Action"] == action_filt]
+        mask &= (df["Action"] == action_filt).to_numpy()
 
-    filtered = filtered.sort_values("Timestamp", ascending=False)
+    filtered = df[mask]
     if n_rows > 0:
-        filtered = filtered.head(int(n_rows))
+        filtered = filtered.nlargest(int(n_rows), "Timestamp")   # top-N select, no full sort
+    else:
+        filtered = filtered.sort_values("Timestamp", ascending=False)
 
+    action_counts = df["Action"].value_counts()
     lc1, lc2, lc3 = st.columns(3)
     lc1.metric("Total Events", len(df))
-    lc2.metric("Logins",  len(df[df["Action"] == "Login"]))
-    lc3.metric("Logouts", len(df[df["Action"] == "Logout"]))
+    lc2.metric("Logins",  int(action_counts.get("Login", 0)))
+    lc3.metric("Logouts", int(action_counts.get("Logout", 0)))
 
     st.dataframe(filtered, hide_index=True, use_container_width=True)
 
@@ -89,13 +123,8 @@ st.divider()
 
 st.subheader("👤 Registered Users")
 
-users_data = _load_sheet(USERS_SHEET)
-
-if not users_data:
+if users_df.empty:
     st.info("No users found.")
 else:
-    safe_cols = ["Username", "Name", "Email", "Role", "Verified", "Created At"]
-    users_df  = pd.DataFrame(users_data)
-    show_cols = [c for c in safe_cols if c in users_df.columns]
-    st.dataframe(users_df[show_cols], hide_index=True, use_container_width=True)
+    st.dataframe(users_df, hide_index=True, use_container_width=True)
     st.caption("To change a user's role or verification status, edit the 👤 Users sheet directly in Google Sheets.")
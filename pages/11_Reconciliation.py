@@ -2,12 +2,14 @@
 Reconciliation — Amazon payout register, CC/bank statement matching, AR aging.
 """
 
-import io
+import time
 import streamlit as st
+import numpy as np
 import pandas as pd
 from datetime import date, datetime
-from utils.sheets import get_spreadsheet
+from utils.sheets import get_spreadsheet, get_revision_id, get_sheets_batch, values_to_frame
 from utils.auth import require_auth
+from utils.disk_cache import read_frame, write_frame, clear_frames
 
 st.set_page_config(page_title="Reconciliation", page_icon="🔍", layout="wide")
 require_auth("business")
@@ -16,114 +18,281 @@ require_auth("business")
 
 PAYOUT_SHEET   = "💰 Payout Register"
 STATEMENT_SHEET = "🏦 Statement Lines"
+TXN_SHEET      = "📒 Business Transactions"
 
-PAYOUT_HEADERS = [
+PAYOUT_HEADERS = (
     "Date Received", "Period Label", "Amount Expected ($)",
     "Amount Received ($)", "Difference ($)", "Account", "Status", "Notes",
-]
-STATEMENT_HEADERS = [
+)
+STATEMENT_HEADERS = (
     "Date", "Description", "Amount ($)", "Account", "Matched", "Notes",
-]
+)
 
 ACCOUNTS     = ["Amex Platinum", "RBC Chequing", "Other"]
-MONTHS       = [f"2026-{m:02d}" for m in range(1, 13)]
+MONTHS       = tuple(f"2026-{m:02d}" for m in range(1, 13))
 MONTH_LABELS = {
     "2026-01": "Jan", "2026-02": "Feb", "2026-03": "Mar",
     "2026-04": "Apr", "2026-05": "May", "2026-06": "Jun",
     "2026-07": "Jul", "2026-08": "Aug", "2026-09": "Sep",
     "2026-10": "Oct", "2026-11": "Nov", "2026-12": "Dec",
 }
-today_mk    = date.today().strftime("%Y-%m")
-past_months = [m for m in MONTHS if m <= today_mk]
+
+
+@st.cache_resource(max_entries=2)
+def _month_options(today_mk: str) -> tuple[tuple[str, ...], dict]:
+    """
+    Month selector options (newest first, up to the current month) and their
+    display labels. Built once per calendar month instead of on every rerun.
+    """
+    past = tuple(m for m in reversed(MONTHS) if m <= today_mk)
+    return past, {m: f"{MONTH_LABELS.get(m, m)} 2026" for m in past}
+
+
+month_options, month_display = _month_options(date.today().strftime("%Y-%m"))
 
 
 # ── Data loaders ───────────────────────────────────────────────────────────────
 
-def _ws(title, headers):
+@st.cache_resource
+def _ws(title: str, headers: tuple[str, ...]):
+    """Worksheet handle, created with its header row if missing. Looked up once per process."""
     ss = get_spreadsheet()
     try:
         return ss.worksheet(title)
     except Exception:
         ws = ss.add_worksheet(title=title, rows=500, cols=len(headers))
-        ws.append_row(headers)
+        ws.append_row(list(headers))
         return ws
 
 
-@st.cache_data(ttl=30)
-def load_payouts() -> list[dict]:
-    try:
-        data = _ws(PAYOUT_SHEET, PAYOUT_HEADERS).get_all_records()
-    except Exception:
-        return []
-    rows = []
-    for i, r in enumerate(data, start=2):
-        if not any(str(v).strip() for v in r.values()):
-            continue
-        def _f(k):
-            try:
-                return float(str(r.get(k, 0)).replace(",", "").replace("$", "") or 0)
-            except (ValueError, TypeError):
-                return 0.0
-        r["_expected"] = _f("Amount Expected ($)")
-        r["_received"] = _f("Amount Received ($)")
-        r["_diff"]     = _f("Difference ($)")
-        r["_row"]      = i
-        r["_date"]     = str(r.get("Date Received", "")).strip()
-        rows.append(r)
-    return rows
-
-
-@st.cache_data(ttl=30)
-def load_statement_lines() -> list[dict]:
-    try:
-        data = _ws(STATEMENT_SHEET, STATEMENT_HEADERS).get_all_records()
-    except Exception:
-        return []
-    rows = []
-    for i, r in enumerate(data, start=2):
-        if not any(str(v).strip() for v in r.values()):
-            continue
-        try:
-            r["_amount"] = float(str(r.get("Amount ($)", 0)).replace(",", "").replace("$", "") or 0)
-        except (ValueError, TypeError):
-            r["_amount"] = 0.0
-        r["_row"]       = i
-        r["_month_key"] = str(r.get("Date", ""))[:7]
-        rows.append(r)
-    return rows
-
-
-@st.cache_data(ttl=30)
-def load_transactions() -> list[dict]:
+TXN_COLUMNS = [
+    "Date", "Vendor / Description", "Category", "Pre-Tax ($)", "GST ($)",
+    "Payment Method", "Hubdoc (Y/N)", "_row", "_month_key",
+]
+
+
+# Shared currency-stripping pattern. Kept as a plain string, not re.compile():
+# pandas only routes str patterns to the Arrow regex kernel — a compiled
+# pattern falls back to a per-element Python loop.
+_MONEY_RE = r"[\$,]"
+
+
+def _to_money(s: pd.Series) -> pd.Series:
+    """Currency text ("$1,234.50") → float in one vectorized pass; blanks/garbage → 0.0."""
+    text = s if pd.api.types.is_string_dtype(s) else s.astype(str)
+    return pd.to_numeric(text.str.replace(_MONEY_RE, "", regex=True), errors="coerce").fillna(0.0)
+
+
+def _parse_money_cols(df: pd.DataFrame, cols: dict[str, str]) -> pd.DataFrame:
+    """Add float columns {new: source}; a source column missing from the sheet gives 0.0."""
+    return df.assign(**{dst: _to_money(df[src]) if src in df.columns else 0.0
+                        for dst, src in cols.items()})
+
+
+def _sheet_frame(values: list[list[str]], headers, first_row: int) -> pd.DataFrame:
+    """Raw tab values → frame with sheet row numbers in _row and blank rows dropped."""
+    df = values_to_frame(values) if values else pd.DataFrame(columns=list(headers))
+    df["_row"] = range(first_row, len(df) + first_row)
+    return df[_non_blank(df.drop(columns="_row"))]
+
+
+# Loaders hand back Arrow-backed frames (convert_dtypes(dtype_backend="pyarrow")):
+# string[pyarrow] text, double/int64/timestamp[pyarrow] numerics, so string
+# matching runs on Arrow compute kernels and the frames are compact in cache.
+
+def _as_category(df: pd.DataFrame, cols: list[str]) -> pd.DataFrame:
+    """Cast the low-cardinality label columns that are present to category."""
+    return df.astype({c: "category" for c in cols if c in df.columns})
+
+
+def _contains_ci(s: pd.Series, key: str) -> pd.Series:
+    """Case-insensitive substring mask. For a categorical only the distinct labels are scanned."""
+    if isinstance(s.dtype, pd.CategoricalDtype):
+        hits = s.cat.categories.astype(str).str.contains(key, case=False, regex=False)
+        return pd.Series(np.append(hits, False)[s.cat.codes], index=s.index)   # code -1 (NaN) → False
+    return s.astype(str).str.contains(key, case=False, regex=False, na=False)
+
+
+def _non_blank(df: pd.DataFrame) -> pd.Series:
+    """Row mask: True where at least one cell has non-whitespace content."""
+    return df.replace(r"^\s*$", np.nan, regex=True).notna().any(axis=1)
+
+
+# Everything below is keyed on the sheet revision (Drive modifiedTime, checked
+# every 30s): while nobody edits the spreadsheet, an expired check costs one
+# metadata request instead of a full re-pull. Parsed frames are also kept on
+# disk under the same revision tag, so a restarted server process doesn't go
+# back to the Sheets API for them.
+
+@st.cache_data(max_entries=2, show_spinner=False)
+def load_all(revision: str) -> tuple[list, list, list]:
+    """
+    Raw values for the payout register, statement lines and business
+    transactions in a single batchGet round-trip. A missing tab fails the whole
+    batch, so on failure the register tabs are created if they don't exist yet
+    and the fetch retried once. Anything still unreadable raises — exceptions
+    aren't cached, so neither an empty result nor its Parquet copy gets pinned
+    under this revision, and the next rerun tries again.
+    """
+    ranges = [PAYOUT_SHEET, STATEMENT_SHEET, TXN_SHEET]
     try:
-        ws       = get_spreadsheet().worksheet("📒 Business Transactions")
-        all_vals = ws.get_all_values()
+        return tuple(get_sheets_batch(ranges))
     except Exception:
-        return []
+        _ws(PAYOUT_SHEET, PAYOUT_HEADERS)
+        _ws(STATEMENT_SHEET, STATEMENT_HEADERS)
+    return tuple(get_sheets_batch(ranges))
+
+
+@st.cache_data(max_entries=2)
+def load_payouts(revision: str) -> pd.DataFrame:
+    df = read_frame("recon_payouts", ttl=None, tag=revision)
+    if df is not None:
+        return df
+    df = _parse_money_cols(_sheet_frame(load_all(revision)[0], PAYOUT_HEADERS, 2), {
+        "_expected": "Amount Expected ($)",
+        "_received": "Amount Received ($)",
+        "_diff":     "Difference ($)",
+    })
+    df["_date"] = pd.to_datetime(df["Date Received"].astype(str).str.strip(),
+                                 format="%Y-%m-%d", errors="coerce")
+    df = _as_category(df.convert_dtypes(dtype_backend="pyarrow"), ["Account", "Status"])
+    write_frame("recon_payouts", df, tag=revision)
+    return df
+
+
+@st.cache_data(max_entries=2)
+def load_statement_lines(revision: str) -> pd.DataFrame:
+    df = read_frame("recon_statement", ttl=None, tag=revision)
+    if df is not None:
+        return df
+    df = _parse_money_cols(_sheet_frame(load_all(revision)[1], STATEMENT_HEADERS, 2),
+                           {"_amount": "Amount ($)"})
+    df["_month_key"] = df["Date"].astype(str).str.slice(0, 7)
+    df = _as_category(df.convert_dtypes(dtype_backend="pyarrow"), ["Account", "Matched"])
+    write_frame("recon_statement", df, tag=revision)
+    return df
+
+
+@st.cache_data(max_entries=2)
+def load_transactions_raw(revision: str) -> pd.DataFrame:
+    """
+    Business Transactions as strings plus _row/_month_key — no numeric parsing.
+    Money columns are only coerced in transactions_for(), after filtering.
+    """
+    df = read_frame("recon_transactions", ttl=None, tag=revision)
+    if df is not None:
+        return df
+    all_vals = load_all(revision)[2]
     if len(all_vals) < 3:
-        return []
-    header = all_vals[2]
-    rows   = []
-    for i, raw in enumerate(all_vals[3:], start=4):
-        if not any(raw):
-            continue
-        padded = raw + [""] * max(0, len(header) - len(raw))
-        d = dict(zip(header, padded))
-        d["_row"] = i
-        def _f(key):
-            try:
-                return float(str(d.get(key, 0)).replace(",", "").replace("$", "") or 0)
-            except (ValueError, TypeError):
-                return 0.0
-        d["_pretax"] = _f("Pre-Tax ($)")
-        d["_gst"]    = _f("GST ($)")
-        d["_total"]  = d["_pretax"] + d["_gst"]
-        date_str = str(d.get("Date", "")).strip()
-        d["_month_key"] = date_str[:7] if len(date_str) >= 7 else ""
-        if not d["_month_key"]:
-            continue
-        rows.append(d)
-    return rows
+        return pd.DataFrame(columns=TXN_COLUMNS)
+    df = _sheet_frame(all_vals[2:], TXN_COLUMNS, 4)      # real header is row 3 (index 2)
+    date_str = df["Date"].astype(str).str.strip()
+    df = df.assign(_month_key=date_str.str.slice(0, 7).where(date_str.str.len() >= 7, ""))
+    df = df[df["_month_key"] != ""].convert_dtypes(dtype_backend="pyarrow")
+    df = _as_category(df, ["Payment Method"])
+    write_frame("recon_transactions", df, tag=revision)
+    return df
+
+
+@st.cache_data(max_entries=32)
+def transactions_for(month: str, pm_key: str, revision: str) -> pd.DataFrame:
+    """One month's transactions for a payment method, with Pre-Tax/GST parsed."""
+    raw = load_transactions_raw(revision)
+    hit = (raw["_month_key"] == month) & _contains_ci(raw["Payment Method"], pm_key)
+    df  = _parse_money_cols(raw[hit], {"_pretax": "Pre-Tax ($)", "_gst": "GST ($)"})
+    df["_total"] = df["_pretax"] + df["_gst"]
+    return df.convert_dtypes(dtype_backend="pyarrow")
+
+
+# ── Cached views ───────────────────────────────────────────────────────────────
+# Keyed on the filter inputs and revision only, so reruns that don't change
+# month/account (expanders, typing in a form) reuse the sorted display tables.
+
+PAYOUT_FORMAT = {"Expected ($)": "${:,.2f}", "Received ($)": "${:,.2f}", "Difference": "${:+.2f}"}
+
+
+@st.cache_data(max_entries=2)
+def payout_totals(revision: str) -> dict:
+    """YTD expected/received sums and discrepancy count for the register header metrics."""
+    df = load_payouts(revision)
+    return {
+        "expected":      float(df["_expected"].sum()),
+        "received":      float(df["_received"].sum()),
+        "discrepancies": int((df["Status"] == "Discrepancy").sum()),
+    }
+
+
+@st.cache_data(max_entries=2)
+def payout_table(revision: str) -> pd.DataFrame:
+    """All payouts, newest first. Money stays numeric — formatted by PAYOUT_FORMAT."""
+    view   = load_payouts(revision).sort_values("_date", ascending=False, kind="stable")
+    status = view["Status"].astype(str)
+    flag   = np.select([status == "Discrepancy", status == "Pending"], ["🔴", "🟡"], "✅")
+    return pd.DataFrame({
+        "Date Received":  view["Date Received"],
+        "Period":         view["Period Label"],
+        "Expected ($)":   view["_expected"],
+        "Received ($)":   view["_received"],
+        "Difference":     view["_diff"],
+        "Account":        view["Account"],
+        "Status":         flag + " " + status,
+        "Notes":          view["Notes"],
+    })
+
+
+@st.cache_data(max_entries=32)
+def statement_view(month: str, account: str, revision: str) -> tuple[pd.DataFrame, pd.DataFrame]:
+    """(statement lines for month/account, display table sorted by date)."""
+    lines   = load_statement_lines(revision)
+    mo_stmt = lines[(lines["_month_key"] == month) & (lines["Account"] == account)]
+    view    = mo_stmt.sort_values("Date", kind="stable")
+    return mo_stmt, pd.DataFrame({
+        "Date":        view["Date"],
+        "Description": view["Description"],
+        "Amount ($)":  view["_amount"].map("${:.2f}".format),
+        "Matched":     view["Matched"],
+        "Notes":       view["Notes"],
+    })
+
+
+@st.cache_data(max_entries=32)
+def transaction_view(month: str, pm_key: str, revision: str) -> tuple[pd.DataFrame, pd.DataFrame]:
+    """(transactions for month/payment method, display table sorted by date)."""
+    mo_txns = transactions_for(month, pm_key, revision)
+    view    = mo_txns.sort_values("Date", kind="stable")
+    return mo_txns, pd.DataFrame({
+        "Date":      view["Date"],
+        "Vendor":    view["Vendor / Description"],
+        "Total ($)": view["_total"].map("${:.2f}".format),
+        "Category":  view["Category"],
+        "Receipt":   view["Hubdoc (Y/N)"],
+    })
+
+
+@st.cache_data(max_entries=32)
+def report_bytes(month: str, account: str, pm_key: str, revision: str,
+                 stmt_total: float, txn_total: float, diff: float) -> bytes:
+    """Downloadable reconciliation report — rebuilt only when the filters or totals change."""
+    mo_stmt, _ = statement_view(month, account, revision)
+    mo_txns, _ = transaction_view(month, pm_key, revision)
+    parts = [
+        f"RECONCILIATION — {MONTH_LABELS.get(month, month)} 2026 — {account}\n"
+        f"Generated: {date.today().isoformat()}\n\n"
+        f"Statement Total:  ${stmt_total:,.2f}\n"
+        f"Logged Total:     ${txn_total:,.2f}\n"
+        f"Difference:       ${diff:+.2f}\n\n"
+        "--- STATEMENT LINES ---\n"
+    ]
+    if not mo_stmt.empty:
+        parts.append(mo_stmt[["Date", "Description", "_amount", "Matched"]].rename(
+            columns={"_amount": "Amount ($)"}
+        ).to_csv(index=False))
+    parts.append("\n--- LOGGED EXPENSES ---\n")
+    if not mo_txns.empty:
+        parts.append(mo_txns[["Date", "Vendor / Description", "_total", "Category"]].rename(
+            columns={"Vendor / Description": "Vendor", "_total": "Total ($)"}
+        ).to_csv(index=False))
+    return "".join(parts).encode("utf-8")
 
 
 # ── Page ───────────────────────────────────────────────────────────────────────
@@ -134,13 +303,17 @@ hc1, hc2 = st.columns([6, 1])
 with hc2:
     if st.button("🔄 Refresh", use_container_width=True):
         st.cache_data.clear()
+        clear_frames()
         st.rerun()
 
 st.divider()
 
-payouts    = load_payouts()
-stmt_lines = load_statement_lines()
-txns       = load_transactions()
+revision = get_revision_id() or f"t{int(time.time() // 30)}"   # metadata down → plain 30s expiry
+try:
+    payouts = load_payouts(revision)
+except Exception as e:
+    st.error(f"Couldn't load the reconciliation sheets: {e}")
+    st.stop()
 
 tab_payouts, tab_recon, tab_ar = st.tabs([
     "💰 Amazon Payouts", "🔍 Statement Reconciliation", "📊 AR Aging"
@@ -159,10 +332,11 @@ with tab_payouts:
     )
 
     # ── YTD metrics ───────────────────────────────────────────────────────────
-    total_expected = sum(p["_expected"] for p in payouts)
-    total_received = sum(p["_received"] for p in payouts)
-    outstanding_ar = total_expected - total_received
-    discrepancies  = [p for p in payouts if p.get("Status") == "Discrepancy"]
+    totals          = payout_totals(revision)
+    total_expected  = totals["expected"]
+    total_received  = totals["received"]
+    outstanding_ar  = total_expected - total_received
+    n_discrepancies = totals["discrepancies"]
 
     mc1, mc2, mc3, mc4 = st.columns(4)
     mc1.metric("Expected YTD",   f"${total_expected:,.0f}",
@@ -172,14 +346,14 @@ with tab_payouts:
     mc3.metric("Outstanding AR", f"${outstanding_ar:,.0f}",
                delta_color="inverse" if outstanding_ar > 500 else "normal",
                help="Expected minus received — money Amazon owes you.")
-    mc4.metric("Discrepancies",  len(discrepancies),
-               delta_color="inverse" if discrepancies else "normal",
+    mc4.metric("Discrepancies",  n_discrepancies,
+               delta_color="inverse" if n_discrepancies else "normal",
                help="Payouts where received differs from expected by more than $1.00.")
 
     st.divider()
 
     # ── Log a payout ──────────────────────────────────────────────────────────
-    with st.expander("➕ Log a payout received", expanded=not payouts):
+    with st.expander("➕ Log a payout received", expanded=payouts.empty):
         with st.form("add_payout_form", clear_on_submit=True):
             fc1, fc2 = st.columns(2)
             with fc1:
@@ -209,32 +383,21 @@ with tab_payouts:
                             diff, p_account, status, p_notes,
                         ])
                         st.cache_data.clear()
+                        clear_frames()
                         st.success(f"Saved — status: **{status}**")
                         st.rerun()
                     except Exception as e:
+                        _ws.clear()     # drop a stale handle (tab renamed/deleted) before the retry
                         st.error(f"Failed to save: {e}")
 
     # ── Payout table ──────────────────────────────────────────────────────────
-    if payouts:
+    if not payouts.empty:
         st.markdown("**All Payouts**")
-        display = []
-        for p in sorted(payouts, key=lambda x: x["_date"], reverse=True):
-            status = p.get("Status", "")
-            flag   = "🔴" if status == "Discrepancy" else ("🟡" if status == "Pending" else "✅")
-            display.append({
-                "Date Received":  p.get("Date Received", ""),
-                "Period":         p.get("Period Label", ""),
-                "Expected ($)":   f"${p['_expected']:,.2f}",
-                "Received ($)":   f"${p['_received']:,.2f}",
-                "Difference":     f"${p['_diff']:+.2f}",
-                "Account":        p.get("Account", ""),
-                "Status":         f"{flag} {status}",
-                "Notes":          p.get("Notes", ""),
-            })
-        st.dataframe(pd.DataFrame(display), hide_index=True, use_container_width=True)
-        if discrepancies:
+        st.dataframe(payout_table(revision).style.format(PAYOUT_FORMAT),
+                     hide_index=True, use_container_width=True)
+        if n_discrepancies:
             st.warning(
-                f"⚠️ {len(discrepancies)} payout(s) have a discrepancy > $1.00. "
+                f"⚠️ {n_discrepancies} payout(s) have a discrepancy > $1.00. "
                 "Check Amazon Seller Central → Payments for the detailed breakdown."
             )
     else:
@@ -277,9 +440,11 @@ with tab_recon:
                             s_account, s_matched, s_notes,
                         ])
                         st.cache_data.clear()
+                        clear_frames()
                         st.success("Statement line added.")
                         st.rerun()
                     except Exception as e:
+                        _ws.clear()     # drop a stale handle (tab renamed/deleted) before the retry
                         st.error(f"Failed to save: {e}")
 
     st.divider()
@@ -288,27 +453,23 @@ with tab_recon:
     rf1, rf2 = st.columns(2)
     with rf1:
         recon_month = st.selectbox(
-            "Month", list(reversed(past_months)),
-            format_func=lambda m: f"{MONTH_LABELS.get(m, m)} 2026",
+            "Month", month_options,
+            format_func=month_display.get,
             key="recon_month",
         )
     with rf2:
         recon_account = st.selectbox("Account", ACCOUNTS, key="recon_account")
 
     # Statement lines for this month + account
-    mo_stmt = [s for s in stmt_lines
-               if s.get("_month_key") == recon_month
-               and s.get("Account") == recon_account]
+    mo_stmt, df_stmt = statement_view(recon_month, recon_account, revision)
 
     # Transactions for this month + matching payment method
     pm_map  = {"Amex Platinum": "amex", "RBC Chequing": "cheq", "Other": "other"}
     pm_key  = pm_map.get(recon_account, "")
-    mo_txns = [t for t in txns
-               if t.get("_month_key") == recon_month
-               and pm_key in str(t.get("Payment Method", "")).lower()]
+    mo_txns, df_txns = transaction_view(recon_month, pm_key, revision)
 
-    stmt_total = round(sum(s["_amount"] for s in mo_stmt), 2)
-    txn_total  = round(sum(t["_total"]  for t in mo_txns), 2)
+    stmt_total = round(float(mo_stmt["_amount"].sum()), 2)
+    txn_total  = round(float(mo_txns["_total"].sum()), 2)
     diff       = round(stmt_total - txn_total, 2)
 
     # ── Summary metrics ───────────────────────────────────────────────────────
@@ -322,7 +483,7 @@ with tab_recon:
                help="Statement − Logged. Near zero = reconciled. Positive = charges not logged. Negative = logged but not on statement.")
     rm4.metric("Statement Lines",  len(mo_stmt))
 
-    if not mo_stmt and not mo_txns:
+    if mo_stmt.empty and mo_txns.empty:
         st.info("No statement lines or expenses for this selection. Add statement lines above, or select a different month/account.")
     elif abs(diff) <= 1.00:
         st.success("✅ Reconciled — statement and logged expenses match within $1.00.")
@@ -338,60 +499,27 @@ with tab_recon:
 
     with left:
         st.markdown(f"**📄 Statement — {MONTH_LABELS.get(recon_month, recon_month)} ({recon_account})**")
-        if mo_stmt:
-            df_stmt = pd.DataFrame([{
-                "Date":        s.get("Date", ""),
-                "Description": s.get("Description", ""),
-                "Amount ($)":  f"${s['_amount']:.2f}",
-                "Matched":     s.get("Matched", "No"),
-                "Notes":       s.get("Notes", ""),
-            } for s in sorted(mo_stmt, key=lambda x: x.get("Date", ""))])
+        if not mo_stmt.empty:
             st.dataframe(df_stmt, hide_index=True, use_container_width=True)
-            unmatched = [s for s in mo_stmt if s.get("Matched", "No").strip().lower() == "no"]
+            unmatched = int((mo_stmt["Matched"].astype(str).str.strip().str.lower() == "no").sum())
             if unmatched:
-                st.caption(f"⚠️ {len(unmatched)} line(s) not yet matched to an expense.")
+                st.caption(f"⚠️ {unmatched} line(s) not yet matched to an expense.")
         else:
             st.info("No statement lines yet.")
 
     with right:
         st.markdown(f"**📒 Logged — {MONTH_LABELS.get(recon_month, recon_month)} ({recon_account})**")
-        if mo_txns:
-            df_txns = pd.DataFrame([{
-                "Date":      t.get("Date", ""),
-                "Vendor":    t.get("Vendor / Description", ""),
-                "Total ($)": f"${t['_total']:.2f}",
-                "Category":  t.get("Category", ""),
-                "Receipt":   t.get("Hubdoc (Y/N)", "N"),
-            } for t in sorted(mo_txns, key=lambda x: x.get("Date", ""))])
+        if not mo_txns.empty:
             st.dataframe(df_txns, hide_index=True, use_container_width=True)
         else:
             st.info("No expenses logged for this account/month.")
 
     # ── Download reconciliation report ────────────────────────────────────────
-    if mo_stmt or mo_txns:
+    if not (mo_stmt.empty and mo_txns.empty):
         st.divider()
-        buf = io.StringIO()
-        buf.write(f"RECONCILIATION — {MONTH_LABELS.get(recon_month, recon_month)} 2026 — {recon_account}\n")
-        buf.write(f"Generated: {date.today().isoformat()}\n\n")
-        buf.write(f"Statement Total:  ${stmt_total:,.2f}\n")
-        buf.write(f"Logged Total:     ${txn_total:,.2f}\n")
-        buf.write(f"Difference:       ${diff:+.2f}\n\n")
-        buf.write("--- STATEMENT LINES ---\n")
-        if mo_stmt:
-            pd.DataFrame([{
-                "Date": s.get("Date"), "Description": s.get("Description"),
-                "Amount ($)": s["_amount"], "Matched": s.get("Matched"),
-            } for s in mo_stmt]).to_csv(buf, index=False)
-        buf.write("\n--- LOGGED EXPENSES ---\n")
-        if mo_txns:
-            pd.DataFrame([{
-                "Date": t.get("Date"), "Vendor": t.get("Vendor / Description"),
-                "Total ($)": t["_total"], "Category": t.get("Category"),
-            } for t in mo_txns]).to_csv(buf, index=False)
-
         st.download_button(
             "⬇️ Download Reconciliation Report",
-            data=buf.getvalue().encode("utf-8"),
+            data=report_bytes(recon_month, recon_account, pm_key, revision, stmt_total, txn_total, diff),
             file_name=f"recon_{recon_month}_{recon_account.replace(' ', '_')}.csv",
             mime="text/csv",
         )
@@ -408,71 +536,50 @@ with tab_ar:
         "grouped by how long they've been waiting."
     )
 
-    pending = [p for p in payouts if p.get("Status") in ("Pending", "Discrepancy")]
+    pending = payouts[payouts["Status"].isin(["Pending", "Discrepancy"])]
 
-    if not pending:
-        if payouts:
+    if pending.empty:
+        if not payouts.empty:
             st.success("✅ No outstanding receivables — all logged payouts have been received.")
         else:
             st.info("No payouts logged yet. Add them in the Amazon Payouts tab.")
     else:
-        today = date.today()
-
-        def _age_days(p) -> int:
-            raw = p.get("Date Received", "")
-            try:
-                return (today - date.fromisoformat(str(raw))).days if raw else 30
-            except Exception:
-                return 30
-
-        buckets = {
-            "Current (0–14 days)": [],
-            "15–30 days":          [],
-            "31–60 days":          [],
-            "60+ days":            [],
-        }
-        for p in pending:
-            age = _age_days(p)
-            if age <= 14:
-                buckets["Current (0–14 days)"].append(p)
-            elif age <= 30:
-                buckets["15–30 days"].append(p)
-            elif age <= 60:
-                buckets["31–60 days"].append(p)
-            else:
-                buckets["60+ days"].append(p)
-
-        ac1, ac2, ac3, ac4 = st.columns(4)
-        for col, (label, items) in zip([ac1, ac2, ac3, ac4], buckets.items()):
-            total = sum(p["_expected"] - p["_received"] for p in items)
-            col.metric(label, f"${total:,.0f}", help=f"{len(items)} payout(s)")
+        # Days waiting — one vectorized subtraction; blank/unparseable dates count as 30
+        age     = (pd.Timestamp(date.today()) - pending["_date"]).dt.days.fillna(30).astype(int)
+        pending = pending.assign(
+            _outstanding=pending["_expected"] - pending["_received"],
+            _age=age,
+            _bucket=pd.cut(age, bins=[-np.inf, 14, 30, 60, np.inf], labels=[
+                "Current (0–14 days)", "15–30 days", "31–60 days", "60+ days",
+            ]),
+        ).sort_values("_date", na_position="first", kind="stable")
+
+        buckets = pending.groupby("_bucket", observed=False)["_outstanding"].agg(["sum", "size"])
+        for col, (label, total, n) in zip(st.columns(4), buckets.itertuples()):
+            col.metric(label, f"${total:,.0f}", help=f"{n} payout(s)")
 
         st.divider()
 
-        ar_rows = []
-        for p in sorted(pending, key=lambda x: x["_date"]):
-            outstanding = p["_expected"] - p["_received"]
-            age         = _age_days(p)
-            bucket      = (
-                "Current (0–14d)"  if age <= 14 else
-                "15–30 days"       if age <= 30 else
-                "31–60 days"       if age <= 60 else
-                "60+ days ⚠️"
-            )
-            ar_rows.append({
-                "Period":      p.get("Period Label", ""),
-                "Expected":    f"${p['_expected']:,.2f}",
-                "Received":    f"${p['_received']:,.2f}",
-                "Outstanding": f"${outstanding:,.2f}",
-                "Age":         f"{age}d",
-                "Bucket":      bucket,
-                "Account":     p.get("Account", ""),
-                "Status":      p.get("Status", ""),
-            })
-
-        st.dataframe(pd.DataFrame(ar_rows), hide_index=True, use_container_width=True)
-
-        total_ar = sum(p["_expected"] - p["_received"] for p in pending)
+        row_labels = np.array(["Current (0–14d)", "15–30 days", "31–60 days", "60+ days ⚠️"])
+        ar_rows = pd.DataFrame({
+            "Period":      pending["Period Label"],
+            "Expected":    pending["_expected"],
+            "Received":    pending["_received"],
+            "Outstanding": pending["_outstanding"],
+            "Age":         pending["_age"],
+            "Bucket":      row_labels[pending["_bucket"].cat.codes],
+            "Account":     pending["Account"],
+            "Status":      pending["Status"],
+        })
+
+        st.dataframe(
+            ar_rows.style.format({
+                "Expected": "${:,.2f}", "Received": "${:,.2f}", "Outstanding": "${:,.2f}", "Age": "{}d",
+            }),
+            hide_index=True, use_container_width=True,
+        )
+
+        total_ar = float(pending["_outstanding"].sum())
         st.markdown(f"**Total Outstanding AR: ${total_ar:,.2f}**")
         st.caption(
             "💡 Once you request a transfer in Seller Central, funds typically arrive within 3–5 business days. "
@@ -10,6 +10,7 @@ Workflow:
 """
 
 import base64
+import hashlib
 import io
 import json
 import os
@@ -19,12 +20,13 @@ import pandas as pd
 import streamlit as st
 from datetime import date, datetime
 from dotenv import load_dotenv
+from gspread.utils import absolute_range_name, numericise_all, rowcol_to_a1, to_records
 
 load_dotenv()  # load .env file so os.getenv() picks up ANTHROPIC_API_KEY
 
 from utils.auth import require_auth
 from utils.drive import upload_receipt, file_id_from_url, embed_url
-from utils.sheets import get_spreadsheet
+from utils.sheets import get_spreadsheet, get_worksheet, get_sheets_batch, values_to_frame
 
 # ── optional Anthropic import ─────────────────────────────────────────────────
 try:
@@ -33,6 +35,13 @@ try:
 except ImportError:
     _ANTHROPIC_AVAILABLE = False
 
+# ── optional RapidFuzz import (vendor similarity) ─────────────────────────────
+try:
+    from rapidfuzz import fuzz, process
+    _RAPIDFUZZ_AVAILABLE = True
+except ImportError:
+    _RAPIDFUZZ_AVAILABLE = False
+
 # ── page config ───────────────────────────────────────────────────────────────
 st.set_page_config(
     page_title="Receipts",
@@ -43,11 +52,21 @@ st.set_page_config(
 require_auth("business")
 
 # ── constants ─────────────────────────────────────────────────────────────────
+RECEIPTS_SHEET = "📸 Receipts"
+TXN_SHEET      = "📒 Business Transactions"
+
+# Helper columns load_transactions adds next to the sheet's own (name → dtype)
+_TXN_COLS = {
+    "_sheet_row": "int64", "_pretax": "float64", "_gst": "float64", "_total": "float64",
+    "_month_key": "str", "_date": "datetime64[ns]", "_vendor_lc": "str", "_matched": "bool",
+}
+
 RECEIPT_HEADERS = [
     "Upload Date", "Receipt Date", "Vendor", "Pre-Tax ($)", "GST ($)",
     "Total ($)", "Category", "Drive URL", "Match Status",
     "Matched Txn Row", "Notes",
 ]
+_MONEY_COLS = ["Pre-Tax ($)", "GST ($)", "Total ($)"]
 
 CATEGORIES = [
     "Inventory — Books (Pallets)",
@@ -71,16 +90,23 @@ MIME_MAP = {
     "pdf": "application/pdf",
 }
 
+_SAFE_VENDOR_RE = re.compile(r"[^\w\-]")   # vendor → Drive filename fragment
+
+# Three-field extraction doesn't need Sonnet — Haiku is several times faster
+OCR_MODEL = "claude-haiku-4-5"
+
 
 # ── sheet helpers ─────────────────────────────────────────────────────────────
 
+@st.cache_resource
 def _ws_receipts():
+    """Receipts worksheet handle, created with its header row if missing. Looked up once per process."""
     ss = get_spreadsheet()
     try:
-        return ss.worksheet("📸 Receipts")
+        return ss.worksheet(RECEIPTS_SHEET)
     except Exception:
         ws = ss.add_worksheet(
-            title="📸 Receipts",
+            title=RECEIPTS_SHEET,
             rows=2000,
             cols=len(RECEIPT_HEADERS) + 2,
         )
@@ -88,54 +114,90 @@ def _ws_receipts():
         return ws
 
 
-@st.cache_data(ttl=30)
-def load_receipts() -> list[dict]:
+@st.cache_data(ttl=300, show_spinner=False)
+def _load_all_sheets() -> dict[str, list[list[str]]]:
+    """Receipts + Business Transactions values in one values.batchGet round-trip."""
+    tabs = [RECEIPTS_SHEET, TXN_SHEET]
     try:
-        ws      = get_spreadsheet().worksheet("📸 Receipts")
-        records = ws.get_all_records()
-        for i, r in enumerate(records, start=2):
-            r["_row"] = i
-        return records
+        return dict(zip(tabs, get_sheets_batch(tabs)))
     except Exception:
-        return []
+        pass
+    # A missing tab (e.g. no receipts saved yet) fails the whole batch — read what exists
+    values = {}
+    for tab in tabs:
+        try:
+            values[tab] = get_worksheet(tab).get_all_values()
+        except Exception:
+            values[tab] = []
+    return values
 
 
-@st.cache_data(ttl=60)
-def load_transactions() -> list[dict]:
-    try:
-        ws       = get_spreadsheet().worksheet("📒 Business Transactions")
-        all_vals = ws.get_all_values()
-    except Exception:
+@st.cache_data(ttl=300, show_spinner=False)
+def load_receipts() -> list[dict]:
+    """Receipt rows as dicts (numbers numericised, like get_all_records) with _row."""
+    values = _load_all_sheets().get(RECEIPTS_SHEET, [])
+    if not values:
         return []
+    header  = values[0]
+    width   = len(header)
+    records = to_records(header, [numericise_all((r + [""] * width)[:width]) for r in values[1:]])
+    for i, r in enumerate(records, start=2):
+        r["_row"] = i
+    return records
 
-    if len(all_vals) < 3:
-        return []
 
-    header = all_vals[2]   # real header is row 3 (index 2)
-    rows   = []
-    for i, raw in enumerate(all_vals[3:], start=4):
-        if not any(raw):
-            continue
-        padded = raw + [""] * max(0, len(header) - len(raw))
-        d      = dict(zip(header, padded))
-        d["_sheet_row"] = i
-
-        def _f(key):
-            try:
-                return float(str(d.get(key, 0)).replace(",", "").replace("$", "") or 0)
-            except (ValueError, TypeError):
-                return 0.0
-
-        d["_pretax"] = _f("Pre-Tax ($)")
-        d["_gst"]    = _f("GST ($)")
-        d["_total"]  = d["_pretax"] + d["_gst"]
-
-        date_str       = str(d.get("Date", "")).strip()
-        d["_month_key"] = date_str[:7] if len(date_str) >= 7 else ""
-        if not d["_month_key"]:
-            continue
-        rows.append(d)
-    return rows
+def _receipts_frame(receipts: list[dict]) -> pd.DataFrame:
+    """
+    Receipt dicts → frame with every RECEIPT_HEADERS column; money columns as
+    float, plus _month (Receipt Date[:7], "" when blank) and _matched.
+    """
+    df = pd.DataFrame(receipts).reindex(columns=RECEIPT_HEADERS, fill_value="")
+    df[_MONEY_COLS] = df[_MONEY_COLS].apply(pd.to_numeric, errors="coerce").fillna(0.0)
+    df["_month"]    = df["Receipt Date"].astype(str).str[:7]
+    df["_matched"]  = df["Match Status"].astype(str).str.strip() == "Matched"
+    return df
+
+
+@st.cache_data(ttl=300, show_spinner=False)
+def load_receipts_frame() -> pd.DataFrame:
+    """load_receipts() as a typed frame, built once per cache window rather than on every rerun."""
+    return _receipts_frame(load_receipts())
+
+
+@st.cache_data(ttl=300, show_spinner=False)
+def load_transactions() -> pd.DataFrame:
+    """
+    Business Transactions (header on row 3) as a frame with parsed helper
+    columns: _sheet_row, _pretax/_gst/_total, _month_key, _date (Timestamp),
+    _vendor_lc and _matched (Hubdoc = Y). Rows without a date are dropped.
+    """
+    all_vals = _load_all_sheets().get(TXN_SHEET, [])
+
+    if len(all_vals) < 3:
+        return pd.DataFrame(columns=list(_TXN_COLS)).astype(_TXN_COLS)
+
+    df = values_to_frame(all_vals[2:])   # real header is row 3 (index 2)
+    df["_sheet_row"] = range(4, len(df) + 4)
+    df = df[[any(raw) for raw in all_vals[3:]]]
+
+    def _col(name):
+        return df[name] if name in df.columns else pd.Series("", index=df.index)
+
+    def _money(name):
+        text = _col(name).str.replace(r"[\$,]", "", regex=True)
+        return pd.to_numeric(text, errors="coerce").fillna(0.0)
+
+    date_str = _col("Date").str.strip()
+    df = df.assign(
+        _pretax    = _money("Pre-Tax ($)"),
+        _gst       = _money("GST ($)"),
+        _month_key = date_str.str[:7].where(date_str.str.len() >= 7, ""),
+        _date      = pd.to_datetime(_col("Date"), format="%Y-%m-%d", errors="coerce"),
+        _vendor_lc = _col("Vendor / Description").str.lower(),
+        _matched   = _col("Hubdoc (Y/N)").str.strip().str.upper().eq("Y"),
+    )
+    df["_total"] = df["_pretax"] + df["_gst"]
+    return df[df["_month_key"] != ""]
 
 
 # ── OCR ───────────────────────────────────────────────────────────────────────
@@ -151,84 +213,189 @@ def _api_key() -> str:
         return ""
 
 
-def _compress_image(image_bytes: bytes) -> tuple[bytes, str]:
-    """Resize image to max 1200px and compress as JPEG. Returns (bytes, mime_type)."""
+@st.cache_resource(show_spinner=False)
+def _anthropic_client(api_key: str):
+    """One Anthropic client per key — its httpx pool keeps the TLS connection warm between OCR calls."""
+    return _anthropic_lib.Anthropic(api_key=api_key)
+
+
+def _compress_image(image_bytes: bytes) -> tuple[memoryview, str]:
+    """
+    Resize image to max 1568px (Claude's recommended long edge — larger is
+    wasted upload and image tokens) and re-encode as progressive JPEG.
+    Returns (memoryview over the JPEG buffer, mime_type) — a view, so the
+    encoded image isn't copied again on its way to base64.
+    """
     from PIL import Image
-    img = Image.open(io.BytesIO(image_bytes))
+    img = Image.open(io.BytesIO(image_bytes))   # lazy: reads the header only
+    # Already a small JPEG → send as-is, no decode/re-encode
+    if (img.format == "JPEG" and img.mode in ("RGB", "L")
+            and len(image_bytes) < 1_500_000 and max(img.size) <= 1568):
+        return memoryview(image_bytes), "image/jpeg"
     if img.mode not in ("RGB", "L"):
         img = img.convert("RGB")
-    if max(img.size) > 2000:
-        img.thumbnail((2000, 2000), Image.LANCZOS)
+    if max(img.size) > 1568:
+        # reducing_gap: cheap box pre-shrink before LANCZOS — much faster on 12MP photos
+        img.thumbnail((1568, 1568), Image.Resampling.LANCZOS, reducing_gap=2.0)
     buf = io.BytesIO()
-    img.save(buf, format="JPEG", quality=85)
-    return buf.getvalue(), "image/jpeg"
+    img.save(buf, format="JPEG", quality=80, optimize=True, progressive=True)
+    return buf.getbuffer(), "image/jpeg"
+
+
+# Forced tool call — the reply arrives as a parsed dict, no text scraping
+_OCR_TOOL = {
+    "name": "extract",
+    "description": "Record the fields read from a receipt.",
+    "input_schema": {
+        "type": "object",
+        "properties": {
+            "vendor":     {"type": ["string", "null"]},
+            "date":       {"type": ["string", "null"], "description": "YYYY-MM-DD"},
+            "total_paid": {"type": ["number", "null"]},
+        },
+        "required": ["vendor", "date", "total_paid"],
+    },
+}
+_JSON_RE = re.compile(r"\{.*\}", re.DOTALL)
+
+
+@st.cache_data(ttl=3600, show_spinner=False)
+def _ocr_cached(img_hash: str, _image_bytes: bytes, mime_type: str) -> dict:
+    """
+    Claude Vision call behind ocr_receipt, cached on the image's content hash.
+    The leading underscore keeps Streamlit from hashing the raw bytes; failures
+    raise so they are never cached.
+    """
+    # Compress before sending — phone photos are often 4-8MB (API limit is 5MB)
+    try:
+        image_bytes, mime_type = _compress_image(_image_bytes)
+    except Exception as e:
+        raise ValueError(f"Image resize failed: {e}") from e
+
+    b64    = base64.b64encode(image_bytes).decode("ascii")
+    client = _anthropic_client(_api_key())
+
+    resp = client.messages.create(
+        model=OCR_MODEL,
+        max_tokens=300,
+        tools=[_OCR_TOOL],
+        tool_choice={"type": "tool", "name": "extract"},
+        messages=[{
+            "role": "user",
+            "content": [
+                {
+                    "type": "image",
+                    "source": {
+                        "type": "base64",
+                        "media_type": mime_type,
+                        "data": b64,
+                    },
+                },
+                {
+                    "type": "text",
+                    "text": (
+                        "Extract from this receipt with the extract tool:\n"
+                        "- vendor: store or business name\n"
+                        "- date: purchase date in YYYY-MM-DD format\n"
+                        "- total_paid: the FINAL grand total the customer actually paid. "
+                        "Look for a line labeled TOTAL, GRAND TOTAL, AMOUNT DUE, BALANCE DUE, "
+                        "VISA, DEBIT, or MASTERCARD near the very bottom of the receipt. "
+                        "This is usually the largest dollar amount on the receipt. "
+                        "Do NOT return a subtotal, tax amount, or line-item amount — "
+                        "return only the single final number the customer was charged.\n"
+                        "Use null for any value you cannot find."
+                    ),
+                },
+            ],
+        }],
+    )
+    for block in resp.content:
+        if block.type == "tool_use":
+            return dict(block.input)
+
+    # Fallback: model answered in text instead of calling the tool
+    text = "".join(getattr(b, "text", "") for b in resp.content).strip()
+    try:
+        return json.loads(text)
+    except json.JSONDecodeError:
+        m = _JSON_RE.search(text)
+        if m:
+            return json.loads(m.group())
+    raise ValueError(f"Claude responded but no JSON found. Raw response: {text[:200]}")
 
 
 def ocr_receipt(image_bytes: bytes, mime_type: str) -> tuple[dict, str]:
     """
     Use Claude Haiku Vision to extract receipt fields.
     Returns (data_dict, error_message). On success error_message is "".
+    Re-extracting the same image is served from cache.
     """
-    key = _api_key()
-    if not key or not _ANTHROPIC_AVAILABLE:
+    if not _api_key() or not _ANTHROPIC_AVAILABLE:
         return {}, "API key not found."
 
-    # Compress before sending — phone photos are often 4-8MB (API limit is 5MB)
+    img_hash = hashlib.blake2b(image_bytes, digest_size=16).hexdigest()
     try:
-        image_bytes, mime_type = _compress_image(image_bytes)
+        return _ocr_cached(img_hash, image_bytes, mime_type), ""
     except Exception as e:
-        return {}, f"Image resize failed: {e}"
+        return {}, str(e)
+
 
-    b64 = base64.b64encode(image_bytes).decode()
-    client = _anthropic_lib.Anthropic(api_key=key)
+# ── matching helpers ──────────────────────────────────────────────────────────
 
+def _parse_receipt_date(value) -> datetime | None:
+    """Exactly YYYY-MM-DD → naive datetime; anything else (times, offsets, junk) → None."""
     try:
-        resp = client.messages.create(
-            model="claude-sonnet-4-6",
-            max_tokens=300,
-            messages=[{
-                "role": "user",
-                "content": [
-                    {
-                        "type": "image",
-                        "source": {
-                            "type": "base64",
-                            "media_type": mime_type,
-                            "data": b64,
-                        },
-                    },
-                    {
-                        "type": "text",
-                        "text": (
-                            "Extract from this receipt. Return ONLY valid JSON with these exact keys:\n"
-                            "- vendor: store or business name\n"
-                            "- date: purchase date in YYYY-MM-DD format\n"
-                            "- total_paid: the FINAL grand total the customer actually paid. "
-                            "Look for a line labeled TOTAL, GRAND TOTAL, AMOUNT DUE, BALANCE DUE, "
-                            "VISA, DEBIT, or MASTERCARD near the very bottom of the receipt. "
-                            "This is usually the largest dollar amount on the receipt. "
-                            "Do NOT return a subtotal, tax amount, or line-item amount — "
-                            "return only the single final number the customer was charged.\n"
-                            "Use null for any value you cannot find. "
-                            "No markdown, no explanation — just the JSON object."
-                        ),
-                    },
-                ],
-            }],
-        )
-        text = resp.content[0].text.strip()
-        m    = re.search(r"\{[^}]+\}", text, re.DOTALL)
-        if m:
-            return json.loads(m.group()), ""
-        return {}, f"Claude responded but no JSON found. Raw response: {text[:200]}"
-    except Exception as e:
-        return {}, str(e)
+        return datetime.strptime(str(value).strip(), "%Y-%m-%d") if value else None
+    except ValueError:
+        return None
 
 
-# ── matching helpers ──────────────────────────────────────────────────────────
+def _vendor_overlap(v1: str, v2: str) -> bool:
+    """Fallback vendor check without RapidFuzz: a shared long word or 6-char prefix."""
+    return any(w in v2 for w in v1.split() if len(w) > 3) or v1[:6] in v2
+
+
+def _match_candidates(recs: pd.DataFrame, txns: pd.DataFrame) -> pd.DataFrame:
+    """
+    Cross receipts (_rid, _rtotal, _rdate, _rvendor) with unmatched transactions
+    in one vectorized pass. Keeps pairs within ±$1.50 and ±10 days, scores them
+    (lower = better) into _match_score, and keeps the best 5 per _rid.
+    """
+    recs  = recs[recs["_rdate"].notna() & (recs["_rtotal"] > 0)]
+    pairs = recs.merge(txns[~txns["_matched"]], how="cross")
+    if pairs.empty:
+        return pairs
+
+    amt_diff = (pairs["_total"] - pairs["_rtotal"]).abs()
+    day_diff = (pairs["_date"] - pairs["_rdate"]).dt.days.abs()
+    keep     = (amt_diff <= 1.50) & (day_diff <= 10)
+    pairs    = pairs[keep]
+    score    = (amt_diff * 10 + day_diff)[keep]
+
+    has_vendor = pairs["_rvendor"] != ""
+    if _RAPIDFUZZ_AVAILABLE:
+        # Token-set similarity 0–100 → up to 10 off the score; catches word order
+        # and suffixes ("COSTCO WHOLESALE #123" vs "Costco")
+        sim   = process.cpdist(pairs["_rvendor"].tolist(), pairs["_vendor_lc"].tolist(),
+                               scorer=fuzz.token_set_ratio)
+        score = score - sim * 0.1 * has_vendor
+    else:
+        # Word overlap bonus
+        overlap = [v1 != "" and _vendor_overlap(v1, v2)
+                   for v1, v2 in zip(pairs["_rvendor"], pairs["_vendor_lc"])]
+        score   = score - 5 * pd.Series(overlap, index=pairs.index, dtype=float)
+
+    pairs = pairs.assign(_match_score=score.round(2))
+    return (pairs.sort_values(["_rid", "_match_score"], kind="stable")
+                 .groupby("_rid", sort=False).head(5))
+
+
+def _match_records(pairs: pd.DataFrame) -> list[dict]:
+    return pairs.drop(columns=["_rid", "_rtotal", "_rdate", "_rvendor"]).to_dict("records")
+
 
 def find_matches(
-    txns: list[dict],
+    txns: pd.DataFrame,
     total_amount: float,
     receipt_date: str,
     vendor: str = "",
@@ -238,76 +405,86 @@ def find_matches(
     Criteria: amount within ±$1.50 AND date within ±10 days.
     Already-matched (Hubdoc=Y) rows are excluded.
     """
-    if not receipt_date or total_amount <= 0:
-        return []
-    try:
-        rdate = datetime.strptime(receipt_date, "%Y-%m-%d")
-    except ValueError:
+    rdate = _parse_receipt_date(receipt_date)
+    if rdate is None or total_amount <= 0 or txns.empty:
         return []
+    recs = pd.DataFrame({"_rid": [0], "_rtotal": [total_amount],
+                         "_rdate": [rdate], "_rvendor": [str(vendor).lower()]})
+    return _match_records(_match_candidates(recs, txns))
 
-    candidates = []
-    for txn in txns:
-        if str(txn.get("Hubdoc (Y/N)", "N")).strip().upper() == "Y":
-            continue
-        if abs(txn["_total"] - total_amount) > 1.50:
-            continue
-        try:
-            tdate = datetime.strptime(txn.get("Date", ""), "%Y-%m-%d")
-        except ValueError:
-            continue
-        if abs((rdate - tdate).days) > 10:
-            continue
 
-        # Lower score = better match
-        score = abs(txn["_total"] - total_amount) * 10 + abs((rdate - tdate).days)
+def find_matches_all(receipts: list[dict], txns: pd.DataFrame) -> dict[int, list[dict]]:
+    """find_matches for many receipts in one cross join → {receipt _row: matches}."""
+    if not receipts or txns.empty:
+        return {}
+    recs = pd.DataFrame({
+        "_rid":     [r["_row"] for r in receipts],
+        "_rtotal":  [float(r.get("Total ($)", 0) or 0) for r in receipts],
+        "_rdate":   pd.to_datetime([_parse_receipt_date(r.get("Receipt Date", "")) for r in receipts]),
+        "_rvendor": [str(r.get("Vendor", "")).lower() for r in receipts],
+    })
+    pairs = _match_candidates(recs, txns)
+    return {rid: _match_records(grp) for rid, grp in pairs.groupby("_rid", sort=False)}
 
-        if vendor:
-            v1 = vendor.lower()
-            v2 = txn.get("Vendor / Description", "").lower()
-            # Word overlap bonus
-            if any(w in v2 for w in v1.split() if len(w) > 3) or v1[:6] in v2:
-                score -= 5
 
-        copy       = dict(txn)
-        copy["_match_score"] = round(score, 2)
-        candidates.append(copy)
+@st.cache_data(ttl=300, show_spinner=False)
+def _header_row(title: str, row: int) -> list:
+    """Header row of a worksheet, memoized so column lookups don't re-fetch it."""
+    values = get_spreadsheet().values_get(absolute_range_name(title, f"{row}:{row}")).get("values")
+    return values[0] if values else []
 
-    return sorted(candidates, key=lambda x: x["_match_score"])[:5]
 
+def _header_col(headers: list, name: str, fallback: int) -> int:
+    return (headers.index(name) + 1) if name in headers else fallback
 
-def mark_txn_matched(txn_row: int, drive_url: str) -> None:
-    """Set Hubdoc = Y and append receipt URL to Notes in Business Transactions."""
-    ss       = get_spreadsheet()
-    t_ws     = ss.worksheet("📒 Business Transactions")
-    t_headers = t_ws.row_values(3)  # header is on row 3
 
-    def _col(name, fallback):
-        return (t_headers.index(name) + 1) if name in t_headers else fallback
+def _cell_a1(tab: str, row: int, col: int) -> str:
+    return absolute_range_name(tab, rowcol_to_a1(row, col))
 
-    hubdoc_col = _col("Hubdoc (Y/N)", 8)
-    notes_col  = _col("Notes", 9)
 
-    t_ws.update_cell(txn_row, hubdoc_col, "Y")
+def _batch_write(cells: list[dict]) -> None:
+    """Write cells on any tabs ({"range": "'Tab'!A1", "values": ...}) in one values.batchUpdate."""
+    get_spreadsheet().values_batch_update(
+        {"valueInputOption": "USER_ENTERED", "data": cells}
+    )
 
-    existing = t_ws.cell(txn_row, notes_col).value or ""
-    note     = f"Receipt: {drive_url}"
+
+def _txn_match_cells(txn_row: int, drive_url: str) -> list[dict]:
+    """Hubdoc = Y plus receipt URL appended to Notes, for a Business Transactions row."""
+    t_headers = _header_row(TXN_SHEET, 3)  # header is on row 3
+    hubdoc_a1 = _cell_a1(TXN_SHEET, txn_row, _header_col(t_headers, "Hubdoc (Y/N)", 8))
+    notes_a1  = _cell_a1(TXN_SHEET, txn_row, _header_col(t_headers, "Notes", 9))
+
+    current   = get_spreadsheet().values_get(notes_a1).get("values") or [[""]]
+    existing  = current[0][0] if current[0] else ""
+    note      = f"Receipt: {drive_url}"
     new_notes = f"{existing} | {note}".strip(" | ") if existing else note
-    t_ws.update_cell(txn_row, notes_col, new_notes)
 
+    return [
+        {"range": hubdoc_a1, "values": [["Y"]]},
+        {"range": notes_a1,  "values": [[new_notes]]},
+    ]
+
+
+def _receipt_match_cells(receipt_row: int, txn_row: int) -> list[dict]:
+    """Match Status = Matched and Matched Txn Row, for a Receipts row."""
+    headers = _header_row(RECEIPTS_SHEET, 1)
+    return [
+        {"range": _cell_a1(RECEIPTS_SHEET, receipt_row, _header_col(headers, "Match Status", 9)),
+         "values": [["Matched"]]},
+        {"range": _cell_a1(RECEIPTS_SHEET, receipt_row, _header_col(headers, "Matched Txn Row", 10)),
+         "values": [[txn_row]]},
+    ]
 
-def update_receipt_match(receipt_row: int, txn_row: int) -> None:
-    """Write Match Status = Matched and Matched Txn Row into the Receipts sheet."""
-    r_ws    = get_spreadsheet().worksheet("📸 Receipts")
-    headers = r_ws.row_values(1)
 
-    def _col(name, fallback):
-        return (headers.index(name) + 1) if name in headers else fallback
+def mark_txn_matched(txn_row: int, drive_url: str) -> None:
+    """Set Hubdoc = Y and append receipt URL to Notes in Business Transactions."""
+    _batch_write(_txn_match_cells(txn_row, drive_url))
 
-    status_col = _col("Match Status", 9)
-    txn_col    = _col("Matched Txn Row", 10)
 
-    r_ws.update_cell(receipt_row, status_col, "Matched")
-    r_ws.update_cell(receipt_row, txn_col, txn_row)
+def link_receipt(receipt_row: int, txn_row: int, drive_url: str) -> None:
+    """Mark both sides of a receipt ↔ transaction match in a single write."""
+    _batch_write(_receipt_match_cells(receipt_row, txn_row) + _txn_match_cells(txn_row, drive_url))
 
 
 # ── page ──────────────────────────────────────────────────────────────────────
@@ -325,18 +502,19 @@ with hc2:
         st.rerun()
 
 receipts = load_receipts()
+rdf      = load_receipts_frame()
 txns     = load_transactions()
 
 # Header summary metrics
-unmatched_r = [r for r in receipts if str(r.get("Match Status", "")).strip() != "Matched"]
-matched_r   = [r for r in receipts if str(r.get("Match Status", "")).strip() == "Matched"]
-no_rcpt     = [t for t in txns if str(t.get("Hubdoc (Y/N)", "N")).strip().upper() != "Y"]
+matched_n   = int(rdf["_matched"].sum())
+unmatched_n = len(rdf) - matched_n
+no_rcpt     = int((~txns["_matched"]).sum())
 
 hm1, hm2, hm3, hm4 = st.columns(4)
-hm1.metric("Receipts Uploaded",        len(receipts))
-hm2.metric("Matched to Transaction",   len(matched_r))
-hm3.metric("Pending Match",            len(unmatched_r))
-hm4.metric("Transactions w/o Receipt", len(no_rcpt))
+hm1.metric("Receipts Uploaded",        len(rdf))
+hm2.metric("Matched to Transaction",   matched_n)
+hm3.metric("Pending Match",            unmatched_n)
+hm4.metric("Transactions w/o Receipt", no_rcpt)
 
 st.divider()
 
@@ -352,10 +530,19 @@ tab_upload, tab_queue, tab_all, tab_bookkeeper = st.tabs([
 # TAB 1 — UPLOAD
 # ══════════════════════════════════════════════════════════════════════════════
 
-with tab_upload:
-
+# Fragment: OCR / widget reruns redraw only this tab, not the whole page
+@st.fragment
+def _upload_tab() -> None:
     st.subheader("Upload a Receipt")
 
+    # Messages from a save, carried over the full rerun that refreshes the page
+    for msg in st.session_state.pop("_receipt_saved", []):
+        st.success(msg)
+
+    # Loaded here (cached), not passed in: fragment-only reruns would otherwise
+    # keep matching against the frame from the last full run
+    txns = load_transactions()
+
     key_present = bool(_api_key()) and _ANTHROPIC_AVAILABLE
     if key_present:
         st.success(
@@ -374,7 +561,7 @@ with tab_upload:
     )
 
     if uploaded:
-        raw_bytes = uploaded.read()
+        raw_bytes = uploaded.getvalue()   # whole buffer, independent of read position
         ext       = uploaded.name.rsplit(".", 1)[-1].lower()
         mime_type = MIME_MAP.get(ext, "image/jpeg")
         is_image  = ext in ("jpg", "jpeg", "png")
@@ -400,7 +587,6 @@ with tab_upload:
                     with st.spinner("Reading receipt with Claude Vision…"):
                         ocr_data, ocr_err = ocr_receipt(raw_bytes, mime_type)
                     if ocr_data:
-                        st.session_state["_ocr_cache"] = ocr_data
                         # Push values directly into widget state so fields populate
                         def _sv(k):
                             v = ocr_data.get(k)
@@ -423,24 +609,14 @@ with tab_upload:
                             st.session_state["r_gst"]        = gst
                         if _sv("date") and len(_sv("date")) == 10:
                             try:
-                                st.session_state["r_date"] = datetime.strptime(_sv("date"), "%Y-%m-%d").date()
+                                st.session_state["r_date"] = date.fromisoformat(_sv("date"))
                             except ValueError:
                                 pass
                         st.session_state["_ocr_debug"] = ocr_data
-                        st.rerun()  # rerender widgets with OCR values
+                        st.rerun(scope="fragment")  # rerender widgets with OCR values
                     else:
                         st.warning(f"Could not extract data — fill in manually.\n\n**Error:** {ocr_err}")
 
-            # Pull from session cache if user already ran OCR this rerun
-            if not ocr_data and st.session_state.get("_ocr_cache"):
-                ocr_data = st.session_state["_ocr_cache"]
-            elif not isinstance(ocr_data, dict):
-                ocr_data = {}
-
-            def _s(key, fallback=""):
-                v = ocr_data.get(key)
-                return str(v) if v and str(v).lower() != "null" else fallback
-
             # Initialise widget state defaults on first render (no OCR yet)
             if "r_date"       not in st.session_state: st.session_state["r_date"]       = date.today()
             if "r_vendor"     not in st.session_state: st.session_state["r_vendor"]     = ""
@@ -537,7 +713,7 @@ with tab_upload:
                 st.error("Please enter a vendor name.")
             else:
                 timestamp   = datetime.now().strftime("%Y%m%d_%H%M%S")
-                safe_vendor = re.sub(r"[^\w\-]", "_", r_vendor.strip())[:30]
+                safe_vendor = _SAFE_VENDOR_RE.sub("_", r_vendor.strip())[:30]
                 filename    = f"{date_str}_{safe_vendor}_{timestamp}.{ext}"
 
                 # ── Save receipt data to Sheets ─────────────────────────────────
@@ -565,22 +741,29 @@ with tab_upload:
                             mark_txn_matched(selected_txn["_sheet_row"], "")
 
                         st.cache_data.clear()
-                        st.session_state.pop("_ocr_cache", None)
 
-                        st.success("✅ Receipt saved!")
+                        saved = ["✅ Receipt saved!"]
                         if selected_txn:
-                            st.success("✅ Transaction marked Hubdoc = Y.")
+                            saved.append("✅ Transaction marked Hubdoc = Y.")
+                        # Full rerun so the header metrics and the other tabs see the save too
+                        st.session_state["_receipt_saved"] = saved
+                        st.rerun()
 
                     except Exception as e:
+                        _ws_receipts.clear()    # drop a stale handle (tab renamed/deleted) before the retry
                         st.error(f"Save failed: {e}")
 
 
+with tab_upload:
+    _upload_tab()
+
+
 # ══════════════════════════════════════════════════════════════════════════════
 # TAB 2 — REVIEW QUEUE
 # ══════════════════════════════════════════════════════════════════════════════
 
-with tab_queue:
-
+@st.fragment
+def _queue_tab(receipts: list[dict], txns: pd.DataFrame) -> None:
     st.subheader("🔍 Receipts Needing a Match")
 
     pending = [
@@ -595,6 +778,8 @@ with tab_queue:
             f"**{len(pending)}** receipt(s) not yet linked to a Business Transaction."
         )
 
+        queue_matches = find_matches_all(pending, txns)
+
         for rec in sorted(pending, key=lambda x: x.get("Receipt Date", ""), reverse=True):
 
             drive_url = rec.get("Drive URL", "")
@@ -611,9 +796,13 @@ with tab_queue:
 
                 with eq1:
                     if file_id:
-                        try:
-                            st.image(embed_url(file_id), use_container_width=True)
-                        except Exception:
+                        # Load the Drive image only on request, not for every pending receipt
+                        if st.toggle("🖼️ Show receipt", key=f"q_img_{rec['_row']}"):
+                            try:
+                                st.image(embed_url(file_id), use_container_width=True)
+                            except Exception:
+                                st.markdown(f"[🔗 View in Drive]({drive_url})")
+                        else:
                             st.markdown(f"[🔗 View in Drive]({drive_url})")
                     elif drive_url:
                         st.markdown(f"[🔗 Open receipt]({drive_url})")
@@ -635,9 +824,7 @@ with tab_queue:
                     st.divider()
 
                     # Candidate matches
-                    r_date_str = rec.get("Receipt Date", "")
-                    r_vendor   = rec.get("Vendor", "")
-                    candidates = find_matches(txns, rec_total, r_date_str, r_vendor)
+                    candidates = queue_matches.get(rec["_row"], [])
 
                     if candidates:
                         st.markdown("**Suggested matches from Business Transactions:**")
@@ -665,11 +852,8 @@ with tab_queue:
                             ):
                                 with st.spinner("Saving…"):
                                     try:
-                                        update_receipt_match(
-                                            rec["_row"], sel_txn["_sheet_row"]
-                                        )
-                                        mark_txn_matched(
-                                            sel_txn["_sheet_row"], drive_url
+                                        link_receipt(
+                                            rec["_row"], sel_txn["_sheet_row"], drive_url
                                         )
                                         st.cache_data.clear()
                                         st.success("Matched!")
@@ -690,15 +874,19 @@ with tab_queue:
                         help="Removes from the Receipts sheet (does not delete the Drive file).",
                     ):
                         try:
-                            ws = get_spreadsheet().worksheet("📸 Receipts")
-                            ws.delete_rows(rec["_row"])
+                            _ws_receipts().delete_rows(rec["_row"])
                             st.cache_data.clear()
                             st.success("Deleted.")
                             st.rerun()
                         except Exception as e:
+                            _ws_receipts.clear()
                             st.error(f"Error: {e}")
 
 
+with tab_queue:
+    _queue_tab(receipts, txns)
+
+
 # ══════════════════════════════════════════════════════════════════════════════
 # TAB 3 — ALL RECEIPTS
 # ══════════════════════════════════════════════════════════════════════════════
@@ -707,16 +895,12 @@ with tab_all:
 
     st.subheader("📋 All Receipts")
 
-    if not receipts:
+    if rdf.empty:
         st.info("No receipts uploaded yet.")
     else:
         fc1, fc2 = st.columns(2)
         with fc1:
-            months_avail = sorted(
-                {str(r.get("Receipt Date", ""))[:7]
-                 for r in receipts if r.get("Receipt Date")},
-                reverse=True,
-            )
+            months_avail = sorted(rdf.loc[rdf["_month"] != "", "_month"].unique(), reverse=True)
             month_filter = st.selectbox(
                 "Filter by month", ["All"] + months_avail, key="all_month"
             )
@@ -725,52 +909,45 @@ with tab_all:
                 "Filter by status", ["All", "Matched", "Unmatched"], key="all_status"
             )
 
-        filtered = receipts
+        mask = pd.Series(True, index=rdf.index)
         if month_filter != "All":
-            filtered = [
-                r for r in filtered
-                if str(r.get("Receipt Date", "")).startswith(month_filter)
-            ]
+            mask &= rdf["_month"] == month_filter
         if status_filter != "All":
-            filtered = [
-                r for r in filtered
-                if str(r.get("Match Status", "")) == status_filter
-            ]
+            mask &= rdf["Match Status"].astype(str) == status_filter
+        filtered = rdf[mask]
 
         ac1, ac2, ac3, ac4 = st.columns(4)
         ac1.metric("Showing",       len(filtered))
-        ac2.metric("Total Spend",   f"${sum(float(r.get('Total ($)', 0) or 0) for r in filtered):,.2f}")
-        ac3.metric("GST (ITCs)",    f"${sum(float(r.get('GST ($)', 0) or 0) for r in filtered):,.2f}")
-        ac4.metric("Matched",       sum(1 for r in filtered if r.get("Match Status") == "Matched"))
+        ac2.metric("Total Spend",   f"${filtered['Total ($)'].sum():,.2f}")
+        ac3.metric("GST (ITCs)",    f"${filtered['GST ($)'].sum():,.2f}")
+        ac4.metric("Matched",       int((filtered["Match Status"] == "Matched").sum()))
 
         st.divider()
 
-        display = []
-        for r in sorted(filtered, key=lambda x: x.get("Receipt Date", ""), reverse=True):
-            display.append({
-                "Date":        r.get("Receipt Date", ""),
-                "Vendor":      r.get("Vendor", ""),
-                "Pre-Tax ($)": f"${float(r.get('Pre-Tax ($)', 0) or 0):.2f}",
-                "GST ($)":     f"${float(r.get('GST ($)', 0) or 0):.2f}",
-                "Total ($)":   f"${float(r.get('Total ($)', 0) or 0):.2f}",
-                "Category":    r.get("Category", ""),
-                "Status":      r.get("Match Status", ""),
-                "Receipt":     r.get("Drive URL", ""),
-                "Notes":       r.get("Notes", ""),
-            })
+        display = (
+            filtered.sort_values("Receipt Date", ascending=False, kind="stable",
+                                 key=lambda d: d.astype(str))
+                    .rename(columns={"Receipt Date": "Date", "Match Status": "Status",
+                                     "Drive URL": "Receipt"})
+            [["Date", "Vendor", "Pre-Tax ($)", "GST ($)", "Total ($)",
+              "Category", "Status", "Receipt", "Notes"]]
+        )
 
         st.dataframe(
-            pd.DataFrame(display),
+            display,
             hide_index=True,
             use_container_width=True,
             column_config={
+                **{c: st.column_config.NumberColumn(c, format="$%.2f") for c in _MONEY_COLS},
                 "Receipt": st.column_config.LinkColumn(
                     "Receipt", display_text="📎 View"
                 ),
             },
         )
 
-        csv = pd.DataFrame(display).to_csv(index=False).encode("utf-8")
+        # Export keeps the "$12.34" text the bookkeeper's sheet expects
+        export = display.assign(**{c: display[c].map("${:.2f}".format) for c in _MONEY_COLS})
+        csv    = export.to_csv(index=False).encode("utf-8")
         st.download_button(
             f"⬇️ Export ({len(filtered)} rows)",
             data=csv,
@@ -791,81 +968,92 @@ with tab_bookkeeper:
         "Share this URL with your bookkeeper — they can open each receipt image directly."
     )
 
-    if not receipts:
+    if rdf.empty:
         st.info("No receipts uploaded yet.")
     else:
-        months_bk = sorted(
-            {str(r.get("Receipt Date", ""))[:7]
-             for r in receipts if r.get("Receipt Date")},
-            reverse=True,
-        )
+        # One grouping serves every month's totals and its receipt slice
+        by_month    = rdf[rdf["_month"] != ""].groupby("_month")
+        monthly     = by_month.agg(
+            n=("Total ($)", "size"), total=("Total ($)", "sum"),
+            gst=("GST ($)", "sum"), matched=("_matched", "sum"),
+        ).sort_index(ascending=False)
+        cat_monthly = rdf.groupby(["_month", "Category"], sort=False)["Total ($)"].sum()
 
         # YTD summary at top
         bk1, bk2, bk3, bk4 = st.columns(4)
-        bk1.metric("Total Receipts",  len(receipts))
-        bk2.metric("Total Spend",     f"${sum(float(r.get('Total ($)', 0) or 0) for r in receipts):,.2f}")
-        bk3.metric("Total GST Paid",  f"${sum(float(r.get('GST ($)', 0) or 0) for r in receipts):,.2f}")
-        bk4.metric("Unmatched",       len(unmatched_r),
-                   delta_color="off" if not unmatched_r else "inverse")
+        bk1.metric("Total Receipts",  len(rdf))
+        bk2.metric("Total Spend",     f"${rdf['Total ($)'].sum():,.2f}")
+        bk3.metric("Total GST Paid",  f"${rdf['GST ($)'].sum():,.2f}")
+        bk4.metric("Unmatched",       unmatched_n,
+                   delta_color="off" if not unmatched_n else "inverse")
 
         st.divider()
 
-        for mk in months_bk:
-            mo_recs     = [r for r in receipts if str(r.get("Receipt Date", "")).startswith(mk)]
-            mo_matched  = sum(1 for r in mo_recs if r.get("Match Status") == "Matched")
-            mo_total    = sum(float(r.get("Total ($)", 0) or 0) for r in mo_recs)
-            mo_gst      = sum(float(r.get("GST ($)", 0) or 0) for r in mo_recs)
-            match_icon  = "✅" if mo_matched == len(mo_recs) else "⚠️"
+        # Compact totals for every month; the full breakdown renders only
+        # for the month picked below instead of inside one expander per month
+        summary = (
+            monthly.assign(unmatched=monthly["n"] - monthly["matched"])
+            .rename_axis("Month").reset_index()
+            .rename(columns={"n": "Receipts", "total": "Spend", "gst": "GST (ITCs)",
+                             "matched": "Matched", "unmatched": "Unmatched"})
+        )
+        st.dataframe(
+            summary,
+            hide_index=True,
+            use_container_width=True,
+            column_config={c: st.column_config.NumberColumn(c, format="$%.2f")
+                           for c in ("Spend", "GST (ITCs)")},
+        )
 
-            with st.expander(
-                f"{match_icon} **{mk}** — {len(mo_recs)} receipts — "
-                f"${mo_total:,.2f} spend — {mo_matched}/{len(mo_recs)} matched",
-                expanded=(mk == months_bk[0]),
-            ):
-                bc1, bc2, bc3 = st.columns(3)
-                bc1.metric("Receipts",     len(mo_recs))
-                bc2.metric("Total Spend",  f"${mo_total:,.2f}")
-                bc3.metric("GST (ITCs)",   f"${mo_gst:,.2f}")
-
-                st.divider()
-
-                # Receipt list with Drive links
-                for r in sorted(mo_recs, key=lambda x: x.get("Receipt Date", "")):
-                    status_icon = "✅" if r.get("Match Status") == "Matched" else "⚠️"
-                    drive_url   = r.get("Drive URL", "")
-                    link_str    = f"[📎 Receipt]({drive_url})" if drive_url else "—"
-                    vendor_str  = r.get("Vendor", "—")[:40]
-                    total_str   = f"${float(r.get('Total ($)', 0) or 0):.2f}"
-                    cat_str     = r.get("Category", "")
+        mk = st.selectbox("Month", monthly.index.tolist(), key="bk_month")
+        if mk is not None:
+            mo          = next(monthly.loc[[mk]].itertuples(index=False))
+            mo_recs     = by_month.get_group(mk)
+            match_icon  = "✅" if mo.matched == mo.n else "⚠️"
 
-                    st.markdown(
-                        f"{status_icon} **{r.get('Receipt Date', '')}** · "
-                        f"{vendor_str} · "
-                        f"{total_str} · "
-                        f"_{cat_str}_ · "
-                        f"{link_str}"
-                    )
+            st.markdown(
+                f"{match_icon} **{mk}** — {mo.n} receipts — "
+                f"${mo.total:,.2f} spend — {mo.matched}/{mo.n} matched"
+            )
 
-                st.divider()
-
-                # Spend by category for this month
-                cats = {}
-                for r in mo_recs:
-                    c = r.get("Category", "Other")
-                    cats[c] = cats.get(c, 0) + float(r.get("Total ($)", 0) or 0)
-
-                if cats:
-                    st.markdown("**By Category**")
-                    cat_df = pd.DataFrame([
-                        {"Category": k, "Spend ($)": round(v, 2)}
-                        for k, v in sorted(cats.items(), key=lambda x: x[1], reverse=True)
-                    ])
-                    st.dataframe(cat_df, hide_index=True, use_container_width=True)
-
-                # Unmatched warning
-                unmatched_mo = [r for r in mo_recs if r.get("Match Status") != "Matched"]
-                if unmatched_mo:
-                    st.warning(
-                        f"{len(unmatched_mo)} receipt(s) not yet matched to a transaction. "
-                        "Go to **Review Queue** tab to link them."
-                    )
+            bc1, bc2, bc3 = st.columns(3)
+            bc1.metric("Receipts",     mo.n)
+            bc2.metric("Total Spend",  f"${mo.total:,.2f}")
+            bc3.metric("GST (ITCs)",   f"${mo.gst:,.2f}")
+
+            st.divider()
+
+            # Receipt list with Drive links
+            mo_list = (
+                mo_recs.sort_values("Receipt Date", kind="stable")
+                .assign(_icon=mo_recs["_matched"].map({True: "✅", False: "⚠️"}),
+                        **{"Drive URL": mo_recs["Drive URL"].replace("", None)})
+                .rename(columns={"_icon": "Status", "Receipt Date": "Date", "Drive URL": "Receipt"})
+                [["Status", "Date", "Vendor", "Total ($)", "Category", "Receipt"]]
+            )
+            st.dataframe(
+                mo_list,
+                hide_index=True,
+                use_container_width=True,
+                column_config={
+                    "Total ($)": st.column_config.NumberColumn("Total ($)", format="$%.2f"),
+                    "Receipt":   st.column_config.LinkColumn("Receipt", display_text="📎 Receipt"),
+                },
+            )
+
+            st.divider()
+
+            # Spend by category for this month
+            cats = cat_monthly.loc[mk].round(2).sort_values(ascending=False, kind="stable")
+            if not cats.empty:
+                st.markdown("**By Category**")
+                cat_df = cats.rename_axis("Category").reset_index(name="Spend ($)")
+                st.dataframe(cat_df, hide_index=True, use_container_width=True)
+
+            # Unmatched warning
+            unmatched_mo = mo.n - mo.matched
+            if unmatched_mo:
+                st.warning(
+                    f"{unmatched_mo} receipt(s) not yet matched to a transaction. "
+                    "Go to **Review Queue** tab to link them."
+                )
@@ -4,10 +4,11 @@ Track vehicle details, loan status, odometer, and maintenance log.
 Data lives in the '🚗 Vehicles' sheet of the masterfile.
 """
 
+import numpy as np
 import streamlit as st
 import pandas as pd
-from datetime import date, datetime
-from utils.sheets import get_spreadsheet
+from datetime import date
+from utils.sheets import get_worksheet
 from utils.auth import require_auth
 
 st.set_page_config(
@@ -26,13 +27,9 @@ MAINTENANCE_DATA_START = 29   # first data row
 
 # ─── Helpers ──────────────────────────────────────────────────────────────────
 
-def _ws():
-    return get_spreadsheet().worksheet(SHEET_NAME)
-
-
 @st.cache_data(ttl=120)
 def load_maintenance() -> list[dict]:
-    ws = _ws()
+    ws = get_worksheet(SHEET_NAME)
     all_vals = ws.get_all_values()
     # Header is row 28 (index 27), data starts at row 29 (index 28)
     if len(all_vals) < 28:
@@ -45,17 +42,25 @@ def load_maintenance() -> list[dict]:
         padded = raw + [""] * max(0, len(header) - len(raw))
         d = dict(zip(header, padded))
         d["_sheet_row"] = i
-        try:
-            d["_cost"] = float(str(d.get("Cost ($)", 0)).replace(",", "").replace("$", "") or 0)
-        except (ValueError, TypeError):
-            d["_cost"] = 0.0
         rows.append(d)
-    return rows
+    if not rows:
+        return []
+
+    # Parse every cost in one vectorized pass; blanks and junk become 0.0
+    df = pd.DataFrame(rows)
+    cost_raw = df["Cost ($)"] if "Cost ($)" in df else pd.Series("", index=df.index)
+    df["_cost"] = pd.to_numeric(
+        cost_raw.astype(str).str.replace(r"[,$]", "", regex=True), errors="coerce"
+    ).fillna(0.0)
+    return df.to_dict("records")
 
 
 def add_maintenance(log_date: str, vehicle: str, km: int, service: str,
                     cost: float, notes: str) -> None:
-    ws = _ws()
+    ws = get_worksheet(SHEET_NAME)
+    # Fresh read of column A right before writing — the cached log may miss rows
+    # added since. append_row isn't used: Sheets' table detection appends after
+    # the last row and never refills gaps.
     col_a = ws.col_values(1)
     # Find first empty row at or after MAINTENANCE_DATA_START
     next_row = MAINTENANCE_DATA_START
@@ -64,7 +69,7 @@ def add_maintenance(log_date: str, vehicle: str, km: int, service: str,
             next_row = i
             break
     else:
-        next_row = len(col_a) + 1
+        next_row = max(len(col_a) + 1, MAINTENANCE_DATA_START)
 
     ws.update(f"A{next_row}:F{next_row}",
               [[log_date, vehicle, km, service, cost, notes]],
@@ -135,38 +140,40 @@ st.caption(
     "Payment method: TD Debit"
 )
 
-# 2026 payment schedule
-with st.expander("📅 2026 Biweekly Payment Schedule"):
-    schedule_2026 = [
-        "2026-01-14", "2026-01-28",
-        "2026-02-11", "2026-02-25",
-        "2026-03-11", "2026-03-25",
-        "2026-04-08", "2026-04-22",
-        "2026-05-06", "2026-05-20",
-        "2026-06-03", "2026-06-17",
-        "2026-07-01", "2026-07-15", "2026-07-29",
-        "2026-08-12", "2026-08-26",
-        "2026-09-09", "2026-09-23",
-        "2026-10-07", "2026-10-21",
-        "2026-11-04", "2026-11-18",
-        "2026-12-02", "2026-12-16", "2026-12-30",
-    ]
-    today = date.today()
-    rows = []
-    running_balance = BALANCE
+SCHEDULE_2026 = [
+    "2026-01-14", "2026-01-28",
+    "2026-02-11", "2026-02-25",
+    "2026-03-11", "2026-03-25",
+    "2026-04-08", "2026-04-22",
+    "2026-05-06", "2026-05-20",
+    "2026-06-03", "2026-06-17",
+    "2026-07-01", "2026-07-15", "2026-07-29",
+    "2026-08-12", "2026-08-26",
+    "2026-09-09", "2026-09-23",
+    "2026-10-07", "2026-10-21",
+    "2026-11-04", "2026-11-18",
+    "2026-12-02", "2026-12-16", "2026-12-30",
+]
+
+
+@st.cache_data
+def _schedule_df(today_iso: str) -> pd.DataFrame:
+    """The 2026 payment schedule with paid/upcoming status as of today_iso."""
+    dts  = pd.to_datetime(SCHEDULE_2026)
     # Approximate: each payment reduces balance by $211.71
     # (simplified — doesn't split principal/interest)
-    for d in schedule_2026:
-        dt = datetime.strptime(d, "%Y-%m-%d").date()
-        status = "✅ Paid" if dt <= today else "⏳ Upcoming"
-        running_balance = max(0, running_balance - BIWEEKLY_PMT)
-        rows.append({
-            "Date": d,
-            "Amount": f"${BIWEEKLY_PMT:.2f}",
-            "Est. Balance After": f"${running_balance:,.2f}",
-            "Status": status,
-        })
-    st.dataframe(pd.DataFrame(rows), use_container_width=True, hide_index=True)
+    bals = np.maximum(0, BALANCE - np.arange(1, len(SCHEDULE_2026) + 1) * BIWEEKLY_PMT)
+    return pd.DataFrame({
+        "Date":               SCHEDULE_2026,
+        "Amount":             f"${BIWEEKLY_PMT:.2f}",
+        "Est. Balance After": pd.Series(bals).map("${:,.2f}".format),
+        "Status":             np.where(dts <= pd.Timestamp(today_iso), "✅ Paid", "⏳ Upcoming"),
+    })
+
+
+# 2026 payment schedule
+with st.expander("📅 2026 Biweekly Payment Schedule"):
+    st.dataframe(_schedule_df(date.today().isoformat()), use_container_width=True, hide_index=True)
     st.caption(
         "⚠️ Balance shown is a simplified estimate (full payment = balance reduction). "
         "Actual principal/interest split depends on your loan agreement."
@@ -200,17 +207,21 @@ with st.expander("➕ Add Maintenance Entry"):
         if not m_service:
             st.error("Enter a service description.")
         else:
-            add_maintenance(
-                m_date.strftime("%Y-%m-%d"),
-                m_vehicle,
-                int(m_km),
-                m_service,
-                m_cost,
-                m_notes,
-            )
-            st.success(f"Saved: {m_vehicle} — {m_service} on {m_date}")
-            st.cache_data.clear()
-            st.rerun()
+            try:
+                add_maintenance(
+                    m_date.strftime("%Y-%m-%d"),
+                    m_vehicle,
+                    int(m_km),
+                    m_service,
+                    m_cost,
+                    m_notes,
+                )
+                st.success(f"Saved: {m_vehicle} — {m_service} on {m_date}")
+                st.cache_data.clear()
+                st.rerun()
+            except Exception as e:
+                get_worksheet.clear()     # drop a stale handle (tab renamed/recreated, expired session) before the retry
+                st.error(f"Failed to save: {e}")
 
 if not maintenance:
     st.info("No maintenance entries yet — use the form above to add the first one.")
@@ -218,16 +229,13 @@ else:
     total_cost = sum(r["_cost"] for r in maintenance)
     st.caption(f"{len(maintenance)} entries  ·  Total maintenance cost: **${total_cost:,.2f}**")
 
-    hcols = st.columns([1.3, 1.8, 1.0, 3.5, 1.0, 2.0])
-    for col, label in zip(hcols, ["Date", "Vehicle", "Km", "Service", "Cost", "Notes"]):
-        col.markdown(f"**{label}**")
-    st.divider()
-
-    for r in maintenance:
-        cols = st.columns([1.3, 1.8, 1.0, 3.5, 1.0, 2.0])
-        cols[0].write(r.get("Date", ""))
-        cols[1].write(r.get("Vehicle", ""))
-        cols[2].write(r.get("Km", ""))
-        cols[3].write(r.get("Service / Work Done", ""))
-        cols[4].write(f"${r['_cost']:.2f}" if r["_cost"] else "—")
-        cols[5].write(r.get("Notes", ""))
+    mdf = (
+        pd.DataFrame(maintenance)
+        .reindex(columns=["Date", "Vehicle", "Km", "Service / Work Done", "_cost", "Notes"])
+        .rename(columns={"Service / Work Done": "Service", "_cost": "Cost"})
+    )
+    mdf["Cost"] = mdf["Cost"].where(mdf["Cost"] != 0)   # blank rather than $0.00
+    st.dataframe(
+        mdf, use_container_width=True, hide_index=True,
+        column_config={"Cost": st.column_config.NumberColumn(format="$%.2f")},
+    )
@@ -4,10 +4,12 @@ Daily trade log, performance analytics, and pattern analysis.
 Data lives in '📈 Trading Journal' sheet of the masterfile.
 """
 
+import numpy as np
 import streamlit as st
 import pandas as pd
 from datetime import date
-from utils.sheets import get_spreadsheet
+from gspread.utils import absolute_range_name
+from utils.sheets import get_spreadsheet, get_worksheet
 from utils.auth import require_auth
 
 st.set_page_config(
@@ -33,20 +35,20 @@ MOODS   = ["", "Calm", "Confident", "Casual", "Eager", "Excited",
 TICKERS = ["MES", "M2K", "Other"]
 POINT_VALUE = 5.0   # MES and M2K: $5 per point
 
+RESULT_CODES = {"Win": 1, "Loss": -1, "Breakeven": 0, "Unknown": 127}
 
-# ─── Sheet helpers ────────────────────────────────────────────────────────────
-
-def _ws():
-    return get_spreadsheet().worksheet(SHEET_NAME)
 
+# ─── Sheet helpers ────────────────────────────────────────────────────────────
 
 @st.cache_data(ttl=120)
 def load_account_info() -> tuple[float, float]:
     """Returns (year_start_balance, current_balance)."""
     try:
-        ws    = _ws()
-        start = ws.acell("B9").value
-        cur   = ws.acell("B10").value
+        # One ranged read instead of an acell round-trip per cell
+        rng   = absolute_range_name(SHEET_NAME, "B9:B10")
+        vals  = get_spreadsheet().values_get(rng).get("values", [])
+        start = vals[0][0] if len(vals) > 0 and vals[0] else ""
+        cur   = vals[1][0] if len(vals) > 1 and vals[1] else ""
         return (
             float(str(start).replace(",", "").replace("$", "")),
             float(str(cur).replace(",", "").replace("$", "")),
@@ -57,7 +59,7 @@ def load_account_info() -> tuple[float, float]:
 
 @st.cache_data(ttl=120)
 def load_trades() -> pd.DataFrame:
-    ws       = _ws()
+    ws       = get_worksheet(SHEET_NAME)
     all_vals = ws.get_all_values()
     if len(all_vals) < DATA_START:
         return pd.DataFrame(columns=HEADERS)
@@ -85,35 +87,46 @@ def load_trades() -> pd.DataFrame:
     mask = df["$ P/L"].isna() & df["Points P/L"].notna()
     df.loc[mask, "$ P/L"] = df.loc[mask, "Points P/L"] * POINT_VALUE
 
-    def result(row):
-        pl = row["Points P/L"]
-        if pd.isna(pl):
-            return "Unknown"
-        if pl > 0:
-            return "Win"
-        elif pl < 0:
-            return "Loss"
-        return "Breakeven"
-
-    df["Result"] = df.apply(result, axis=1)
+    pl = df["Points P/L"]
+    df["Result"] = np.select(
+        [pl > 0, pl < 0, pl == 0], ["Win", "Loss", "Breakeven"], default="Unknown"
+    )
     df["Mood"]   = df["Mood"].fillna("").str.strip()
     df["Ticker"] = df["Ticker"].fillna("").str.strip()
     return df.sort_values("Date", na_position="last").reset_index(drop=True)
 
 
 def add_trade_row(row_data: list) -> None:
-    ws       = _ws()
-    all_vals = ws.get_all_values()
-    next_row = DATA_START
-    for i, raw in enumerate(all_vals[DATA_START - 1:], start=DATA_START):
+    ws = get_worksheet(SHEET_NAME)
+    # Fresh read of just the trade columns right before writing — the cached
+    # trades may miss rows added since. append_row isn't used: Sheets' table
+    # detection appends after the last row and never refills gaps.
+    vals     = ws.get_values(f"A{DATA_START}:O")
+    next_row = DATA_START + len(vals)
+    for i, raw in enumerate(vals, start=DATA_START):
         if not any(str(v).strip() for v in raw):
             next_row = i
             break
-    else:
-        next_row = len(all_vals) + 1
     ws.update(f"A{next_row}:O{next_row}", [row_data], value_input_option="USER_ENTERED")
 
 
+def trade_pl(entry: float, exit_: float, direction: str) -> tuple[float | None, float | None]:
+    """(points, dollars) for a trade, or (None, None) until both prices are set."""
+    if entry <= 0 or exit_ <= 0:
+        return None, None
+    pts = (exit_ - entry) if direction == "Long" else (entry - exit_)
+    return pts, round(pts * POINT_VALUE, 2)
+
+
+def _streak(codes: np.ndarray) -> tuple[int, int]:
+    """(result code, length) of the leading run in codes, skipping Unknown."""
+    known = codes[codes != RESULT_CODES["Unknown"]]
+    if not known.size:
+        return 0, 0
+    breaks = np.flatnonzero(known != known[0])
+    return int(known[0]), int(breaks[0]) if breaks.size else int(known.size)
+
+
 # ─── Page ─────────────────────────────────────────────────────────────────────
 
 st.title("📈 Trading Journal")
@@ -129,34 +142,28 @@ ytd_dollar = account_balance - year_start
 
 # Only trades with a P/L recorded
 df_s = df[df["Points P/L"].notna()].copy()
+df_s["_is_win"] = (df_s["Result"] == "Win").astype(np.int8)
 
-wins = df_s[df_s["Result"] == "Win"]
-losses = df_s[df_s["Result"] == "Loss"]
-bes    = df_s[df_s["Result"] == "Breakeven"]
+# One pass each for per-result counts and average points
+counts     = df_s["Result"].value_counts()
+means      = df_s.groupby("Result")["Points P/L"].mean()
 
 total      = len(df_s)
-win_count  = len(wins)
-loss_count = len(losses)
-be_count   = len(bes)
+win_count  = int(counts.get("Win", 0))
+loss_count = int(counts.get("Loss", 0))
+be_count   = int(counts.get("Breakeven", 0))
 win_rate   = (win_count / total * 100) if total > 0 else 0.0
 
 total_pts  = df_s["Points P/L"].sum()
 total_pnl  = df_s["$ P/L"].sum()
-avg_win    = wins["Points P/L"].mean()  if win_count  > 0 else 0.0
-avg_loss   = abs(losses["Points P/L"].mean()) if loss_count > 0 else 0.0
+avg_win    = float(means.get("Win", 0.0))
+avg_loss   = abs(float(means.get("Loss", 0.0)))
 rr         = (avg_win / avg_loss) if avg_loss > 0 else 0.0
 
 # Current streak
-streak, streak_type = 0, ""
-for res in df_s["Result"].iloc[::-1]:
-    if res == "Unknown":
-        continue
-    if streak == 0:
-        streak_type, streak = res, 1
-    elif res == streak_type:
-        streak += 1
-    else:
-        break
+codes        = df_s["Result"].map(RESULT_CODES).to_numpy(np.int8)[::-1]
+code, streak = _streak(codes)
+streak_type  = {v: k for k, v in RESULT_CODES.items()}[code] if streak else ""
 
 
 # ─── Dashboard ────────────────────────────────────────────────────────────────
@@ -256,10 +263,8 @@ with st.expander("➕ Add Trade"):
     t_comments = st.text_area("Why I Took It / Comments", key="t_comments")
 
     # Auto-calculate
-    pts, dollars = None, None
-    if t_entry > 0 and t_exit > 0:
-        pts    = (t_exit - t_entry) if t_dir == "Long" else (t_entry - t_exit)
-        dollars = round(pts * POINT_VALUE, 2)
+    pts, dollars = trade_pl(t_entry, t_exit, t_dir)
+    if pts is not None:
         colour = "green" if pts > 0 else ("red" if pts < 0 else "gray")
         st.markdown(
             f"<span style='color:{colour}; font-weight:700; font-size:1.05rem;'>"
@@ -281,11 +286,15 @@ with st.expander("➕ Add Trade"):
                 round(pts, 2) if pts is not None else "",
                 dollars if dollars is not None else "",
             ]
-            add_trade_row(row)
-            label = f"{pts:+.2f} pts" if pts is not None else "saved"
-            st.success(f"Trade saved — {t_dir} {t_ticker} {label}")
-            st.cache_data.clear()
-            st.rerun()
+            try:
+                add_trade_row(row)
+                label = f"{pts:+.2f} pts" if pts is not None else "saved"
+                st.success(f"Trade saved — {t_dir} {t_ticker} {label}")
+                st.cache_data.clear()
+                st.rerun()
+            except Exception as e:
+                get_worksheet.clear()     # drop a stale handle (tab renamed/recreated, expired session) before the retry
+                st.error(f"Failed to save: {e}")
 
 st.divider()
 
@@ -297,9 +306,12 @@ if not df_s.empty:
     show = ["Date", "Paper/Real", "Direction", "Ticker", "Price In",
             "Price Out", "Points P/L", "$ P/L", "Mood", "Result", "Comments"]
     show   = [c for c in show if c in df_s.columns]
-    recent = df_s[show].tail(20).copy()
-    recent["Date"] = recent["Date"].dt.strftime("%b %d, %Y")
-    recent = recent.iloc[::-1].reset_index(drop=True)
+    # Last 20 rows newest-first in one slice; undated trades stay on top as before
+    recent = (
+        df_s.iloc[:-21:-1][show]
+        .assign(Date=lambda d: d["Date"].dt.strftime("%b %d, %Y"))
+        .reset_index(drop=True)
+    )
     st.dataframe(recent, use_container_width=True, hide_index=True)
 else:
     st.info("No trades logged yet.")
@@ -317,19 +329,25 @@ if total < 5:
 else:
     tab1, tab2, tab3, tab4 = st.tabs(
         ["Direction", "Mood", "Symbol", "Insights"])
+    # Tables keep raw floats; Streamlit formats them for display
+    analyzer_cols = {
+        "Win Rate":  st.column_config.NumberColumn("Win Rate",  format="%.1f%%"),
+        "Avg Pts":   st.column_config.NumberColumn("Avg Pts",   format="%.2f"),
+        "Total P&L": st.column_config.NumberColumn("Total P&L", format="$%+.2f"),
+    }
 
     with tab1:
         by_dir = df_s.groupby("Direction").agg(
             Trades   =("Result", "count"),
-            Wins     =("Result", lambda x: (x == "Win").sum()),
+            Wins     =("_is_win", "sum"),
             AvgPts   =("Points P/L", "mean"),
             TotalPnL =("$ P/L", "sum"),
         ).reset_index()
-        by_dir["Win Rate"] = (by_dir["Wins"] / by_dir["Trades"] * 100).round(1).astype(str) + "%"
-        by_dir["Avg Pts"]  = by_dir["AvgPts"].round(2)
-        by_dir["Total P&L"] = by_dir["TotalPnL"].apply(lambda x: f"${x:+.2f}")
+        by_dir["Win Rate"] = by_dir["Wins"] / by_dir["Trades"] * 100
+        by_dir["Avg Pts"]  = by_dir["AvgPts"]
+        by_dir["Total P&L"] = by_dir["TotalPnL"]
         st.dataframe(by_dir[["Direction", "Trades", "Win Rate", "Avg Pts", "Total P&L"]],
-                     use_container_width=True, hide_index=True)
+                     use_container_width=True, hide_index=True, column_config=analyzer_cols)
 
     with tab2:
         mood_df = df_s[df_s["Mood"] != ""]
@@ -338,27 +356,27 @@ else:
         else:
             by_mood = mood_df.groupby("Mood").agg(
                 Trades =("Result", "count"),
-                Wins   =("Result", lambda x: (x == "Win").sum()),
+                Wins   =("_is_win", "sum"),
                 AvgPts =("Points P/L", "mean"),
             ).reset_index()
-            by_mood["Win Rate"] = (by_mood["Wins"] / by_mood["Trades"] * 100).round(1).astype(str) + "%"
-            by_mood["Avg Pts"]  = by_mood["AvgPts"].round(2)
+            by_mood["Win Rate"] = by_mood["Wins"] / by_mood["Trades"] * 100
+            by_mood["Avg Pts"]  = by_mood["AvgPts"]
             by_mood = by_mood.sort_values("Wins", ascending=False)
             st.dataframe(by_mood[["Mood", "Trades", "Win Rate", "Avg Pts"]],
-                         use_container_width=True, hide_index=True)
+                         use_container_width=True, hide_index=True, column_config=analyzer_cols)
 
     with tab3:
         by_tick = df_s.groupby("Ticker").agg(
             Trades   =("Result", "count"),
-            Wins     =("Result", lambda x: (x == "Win").sum()),
+            Wins     =("_is_win", "sum"),
             AvgPts   =("Points P/L", "mean"),
             TotalPnL =("$ P/L", "sum"),
         ).reset_index()
-        by_tick["Win Rate"] = (by_tick["Wins"] / by_tick["Trades"] * 100).round(1).astype(str) + "%"
-        by_tick["Avg Pts"]  = by_tick["AvgPts"].round(2)
-        by_tick["Total P&L"] = by_tick["TotalPnL"].apply(lambda x: f"${x:+.2f}")
+        by_tick["Win Rate"] = by_tick["Wins"] / by_tick["Trades"] * 100
+        by_tick["Avg Pts"]  = by_tick["AvgPts"]
+        by_tick["Total P&L"] = by_tick["TotalPnL"]
         st.dataframe(by_tick[["Ticker", "Trades", "Win Rate", "Avg Pts", "Total P&L"]],
-                     use_container_width=True, hide_index=True)
+                     use_container_width=True, hide_index=True, column_config=analyzer_cols)
 
     with tab4:
         insights = []
@@ -383,13 +401,11 @@ else:
                 f"Either cut losses faster or hold winners longer.")
 
         # Mood: Calm vs Excited
-        mood_df2 = df_s[df_s["Mood"] != ""]
-        if not mood_df2.empty:
-            calm_trades = mood_df2[mood_df2["Mood"] == "Calm"]
-            excited_trades = mood_df2[mood_df2["Mood"] == "Excited"]
-            if len(calm_trades) >= 2 and len(excited_trades) >= 2:
-                calm_wr = (calm_trades["Result"] == "Win").mean() * 100
-                excited_wr = (excited_trades["Result"] == "Win").mean() * 100
+        mood_wr = df_s.groupby("Mood")["_is_win"].agg(["mean", "size"]).drop("", errors="ignore")
+        if not mood_wr.empty:
+            if mood_wr["size"].get("Calm", 0) >= 2 and mood_wr["size"].get("Excited", 0) >= 2:
+                calm_wr    = mood_wr.at["Calm", "mean"]    * 100
+                excited_wr = mood_wr.at["Excited", "mean"] * 100
                 if calm_wr > excited_wr + 10:
                     insights.append(
                         f"🧠 **Calm: {calm_wr:.0f}% win rate vs Excited: {excited_wr:.0f}%.** "
@@ -401,20 +417,19 @@ else:
 
             # Negative mood warning
             bad_moods = ["Anxious", "Panicky", "Emotional", "Stubborn"]
-            bad_df = mood_df2[mood_df2["Mood"].isin(bad_moods)]
+            bad_df = df_s.loc[df_s["Mood"].isin(bad_moods), ["Mood", "_is_win"]]
             if len(bad_df) >= 2:
-                bad_wr = (bad_df["Result"] == "Win").mean() * 100
+                bad_wr = bad_df["_is_win"].mean() * 100
                 if bad_wr < win_rate - 10:
                     insights.append(
                         f"🚨 **Win rate drops to {bad_wr:.0f}% when trading {', '.join(bad_df['Mood'].unique())}.** "
                         f"If you're in one of these states, step away from the screen.")
 
         # Direction bias
-        long_df  = df_s[df_s["Direction"] == "Long"]
-        short_df = df_s[df_s["Direction"] == "Short"]
-        if len(long_df) >= 3 and len(short_df) >= 3:
-            long_wr  = (long_df["Result"]  == "Win").mean() * 100
-            short_wr = (short_df["Result"] == "Win").mean() * 100
+        dir_wr = df_s.groupby("Direction")["_is_win"].agg(["mean", "size"])
+        if dir_wr["size"].get("Long", 0) >= 3 and dir_wr["size"].get("Short", 0) >= 3:
+            long_wr  = dir_wr.at["Long", "mean"]  * 100
+            short_wr = dir_wr.at["Short", "mean"] * 100
             better   = "Long" if long_wr > short_wr else "Short"
             diff     = abs(long_wr - short_wr)
             if diff > 10:
@@ -423,11 +438,10 @@ else:
                     f"You perform better going {better}. Consider sizing up on {better} setups.")
 
         # Paper vs Real
-        paper_df = df_s[df_s["Paper/Real"] == "Paper Trade"]
-        real_df  = df_s[df_s["Paper/Real"] == "Real Trade"]
-        if len(paper_df) >= 3 and len(real_df) >= 3:
-            paper_wr = (paper_df["Result"] == "Win").mean() * 100
-            real_wr  = (real_df["Result"]  == "Win").mean() * 100
+        pr_wr = df_s.groupby("Paper/Real")["_is_win"].agg(["mean", "size"])
+        if pr_wr["size"].get("Paper Trade", 0) >= 3 and pr_wr["size"].get("Real Trade", 0) >= 3:
+            paper_wr = pr_wr.at["Paper Trade", "mean"] * 100
+            real_wr  = pr_wr.at["Real Trade", "mean"]  * 100
             if paper_wr - real_wr > 15:
                 insights.append(
                     f"💡 **Paper: {paper_wr:.0f}% win rate vs Real: {real_wr:.0f}%.** "
@@ -7,7 +7,7 @@ Compare against QuickBooks to verify accuracy.
 import streamlit as st
 import pandas as pd
 from datetime import date
-from utils.sheets import get_spreadsheet
+from utils.sheets import get_worksheet, get_sheets_batch
 from utils.auth import require_auth
 
 st.set_page_config(
@@ -18,7 +18,9 @@ st.set_page_config(
 
 require_auth("business")
 
-SHEET_NAME = "📊 Net Worth"
+SHEET_NAME    = "📊 Net Worth"
+AMAZON_SHEET  = "📊 Amazon 2026"
+TXN_SHEET     = "📒 Business Transactions"
 
 # Row positions in the sheet (1-based)
 ROW_LAST_UPDATED = 2
@@ -30,23 +32,49 @@ ROW_AMEX_PLAT    = 7
 ROW_AMEX_BON     = 8
 ROW_CAP_ONE      = 9
 
+# Everything the page reads, fetched in one values.batchGet
+BALANCES_RANGE = f"{SHEET_NAME}!B{ROW_LAST_UPDATED}:B{ROW_CAP_ONE}"
+REVENUE_RANGE  = f"{AMAZON_SHEET}!B2:B"
+EXPENSES_RANGE = f"{TXN_SHEET}!A1:F"
+
 
 # ─── Data loaders ─────────────────────────────────────────────────────────────
 
+@st.cache_data(ttl=60)
+def _load_all_sheets() -> dict[str, list[list[str]]]:
+    """Balances, Amazon revenue and expense ledger values in one values.batchGet round-trip."""
+    ranges = [BALANCES_RANGE, REVENUE_RANGE, EXPENSES_RANGE]
+    try:
+        return dict(zip(ranges, get_sheets_batch(ranges)))
+    except Exception:
+        pass
+    # A missing tab fails the whole batch — read what exists
+    values = {}
+    for rng in ranges:
+        try:
+            values[rng] = get_sheets_batch([rng])[0]
+        except Exception:
+            values[rng] = []
+    return values
+
+
 @st.cache_data(ttl=60)
 def load_balances() -> dict:
     try:
-        ws   = get_spreadsheet().worksheet(SHEET_NAME)
-        vals = ws.col_values(2)   # column B
+        # Column B from ROW_LAST_UPDATED down, keyed by sheet row
+        cells = {
+            row: (r[0] if r else "")
+            for row, r in enumerate(_load_all_sheets()[BALANCES_RANGE], start=ROW_LAST_UPDATED)
+        }
 
-        def _f(idx):
+        def _f(row):
             try:
-                return float(str(vals[idx - 1]).replace(",", "").replace("$", "") or 0)
+                return float(str(cells.get(row, "")).replace(",", "").replace("$", "") or 0)
             except Exception:
                 return 0.0
 
         return {
-            "last_updated": vals[ROW_LAST_UPDATED - 1] if len(vals) >= ROW_LAST_UPDATED else "",
+            "last_updated": cells.get(ROW_LAST_UPDATED, ""),
             "bank":         _f(ROW_BANK),
             "amazon_owed":  _f(ROW_AMAZON_OWED),
             "inventory":    _f(ROW_INVENTORY),
@@ -66,41 +94,40 @@ def load_balances() -> dict:
 @st.cache_data(ttl=120)
 def load_ytd_revenue() -> float:
     try:
-        ws    = get_spreadsheet().worksheet("📊 Amazon 2026")
-        vals  = ws.get_all_values()
-        total = 0.0
-        for row in vals[1:]:
-            if row and len(row) > 1 and row[1]:
-                try:
-                    total += float(str(row[1]).replace(",", ""))
-                except ValueError:
-                    pass
-        return round(total, 2)
+        sales = pd.Series([r[0] if r else "" for r in _load_all_sheets()[REVENUE_RANGE]], dtype=str)
+        total = pd.to_numeric(sales.str.replace(",", "", regex=False), errors="coerce").sum()
+        return round(float(total), 2)
     except Exception:
         return 0.0
 
 
 @st.cache_data(ttl=120)
-def load_ytd_expenses() -> tuple[float, dict]:
-    """Returns (total, {category: amount}) from Business Transactions (col F = Total)."""
+def load_ytd_expenses() -> tuple[float, pd.DataFrame]:
+    """
+    Returns (total, per-category frame) from Business Transactions (col F = Total).
+    The frame has Category / Total ($) columns, largest total first.
+    """
+    empty = pd.DataFrame({"Category": [], "Total ($)": []})
     try:
-        ws   = get_spreadsheet().worksheet("📒 Business Transactions")
-        rows = ws.get_all_values()
-        total  = 0.0
-        by_cat: dict[str, float] = {}
-        for row in rows[3:]:   # skip title, warning, headers
-            if not row or not row[0]:
-                continue
-            try:
-                cat = row[2] if len(row) > 2 else "Uncategorized"
-                val = float(str(row[5]).replace(",", "").replace("$", "") or 0) if len(row) > 5 else 0.0
-                total += val
-                by_cat[cat] = by_cat.get(cat, 0.0) + val
-            except (ValueError, IndexError):
-                continue
-        return round(total, 2), {k: round(v, 2) for k, v in sorted(by_cat.items(), key=lambda x: -x[1])}
+        rows = _load_all_sheets()[EXPENSES_RANGE]
+        # Ragged rows pad with None, so a missing category cell stays distinct from a blank one
+        df = pd.DataFrame(rows[3:]).reindex(columns=range(6))   # skip title, warning, headers
+        df = df[df[0].notna() & (df[0] != "")]
+        if df.empty:
+            return 0.0, empty
+
+        raw = df[5].fillna("").astype(str).str.replace(r"[,$]", "", regex=True)
+        val = pd.to_numeric(raw, errors="coerce")
+        ok  = val.notna() | (raw == "")   # unparseable amounts drop the whole row
+        val = val[ok].fillna(0.0)
+        by_cat = (
+            val.groupby(df.loc[ok, 2].fillna("Uncategorized"), sort=False).sum()
+            .sort_values(ascending=False, kind="stable")
+        )
+        cat_df = pd.DataFrame({"Category": by_cat.index, "Total ($)": by_cat.round(2).to_numpy()})
+        return round(float(val.sum()), 2), cat_df
     except Exception:
-        return 0.0, {}
+        return 0.0, empty
 
 
 # ─── Page ─────────────────────────────────────────────────────────────────────
@@ -111,10 +138,10 @@ if st.button("🔄 Refresh"):
     st.cache_data.clear()
     st.rerun()
 
-bal              = load_balances()
-revenue          = load_ytd_revenue()
-total_exp, cats  = load_ytd_expenses()
-net_profit       = round(revenue - total_exp, 2)
+bal               = load_balances()
+revenue           = load_ytd_revenue()
+total_exp, cat_df = load_ytd_expenses()
+net_profit        = round(revenue - total_exp, 2)
 
 total_assets = round(bal["bank"] + bal["amazon_owed"] + bal["inventory"], 2)
 total_liab   = round(bal["tesla_loan"] + bal["amex_plat"] + bal["amex_bon"] + bal["cap_one"], 2)
@@ -133,12 +160,10 @@ c3.metric("Net Profit",   f"${net_profit:,.2f}",
           delta_color="normal" if net_profit >= 0 else "inverse")
 
 with st.expander("Expense breakdown by category"):
-    if cats:
-        cat_df = pd.DataFrame([
-            {"Category": k, "Total ($)": f"${v:,.2f}"}
-            for k, v in cats.items()
-        ])
-        st.dataframe(cat_df, use_container_width=True, hide_index=True)
+    if not cat_df.empty:
+        # Keep the totals numeric so the column sorts by amount, not by text
+        st.dataframe(cat_df.style.format({"Total ($)": "${:,.2f}"}),
+                     use_container_width=True, hide_index=True)
     else:
         st.info("No expense data found.")
 
@@ -211,18 +236,24 @@ with st.form("balances_form", clear_on_submit=False):
         f_cap    = st.number_input("Capital One Visa ($)",      min_value=0.0, step=100.0, value=bal["cap_one"],    format="%.2f")
 
     if st.form_submit_button("💾 Save Balances", type="primary"):
-        ws        = get_spreadsheet().worksheet(SHEET_NAME)
         today_str = date.today().strftime("%Y-%m-%d")
-        ws.batch_update([
-            {"range": f"B{ROW_LAST_UPDATED}", "values": [[today_str]]},
-            {"range": f"B{ROW_BANK}",         "values": [[f_bank]]},
-            {"range": f"B{ROW_AMAZON_OWED}",  "values": [[f_amz_owed]]},
-            {"range": f"B{ROW_INVENTORY}",    "values": [[f_inventory]]},
-            {"range": f"B{ROW_TESLA_LOAN}",   "values": [[f_tesla]]},
-            {"range": f"B{ROW_AMEX_PLAT}",    "values": [[f_amex_p]]},
-            {"range": f"B{ROW_AMEX_BON}",     "values": [[f_amex_b]]},
-            {"range": f"B{ROW_CAP_ONE}",      "values": [[f_cap]]},
-        ])
-        st.success(f"Balances saved as of {today_str}")
-        st.cache_data.clear()
-        st.rerun()
+        try:
+            # Rows ROW_LAST_UPDATED..ROW_CAP_ONE are contiguous — one range, one write
+            get_worksheet(SHEET_NAME).update(f"B{ROW_LAST_UPDATED}:B{ROW_CAP_ONE}", [
+                [today_str],
+                [f_bank],
+                [f_amz_owed],
+                [f_inventory],
+                [f_tesla],
+                [f_amex_p],
+                [f_amex_b],
+                [f_cap],
+            ])
+            st.success(f"Balances saved as of {today_str}")
+            # Only this page's balance reads are stale — other pages keep their caches
+            _load_all_sheets.clear()
+            load_balances.clear()
+            st.rerun()
+        except Exception as e:
+            get_worksheet.clear()     # drop a stale handle (tab renamed/recreated, expired session) before the retry
+            st.error(f"Failed to save: {e}")
@@ -5,7 +5,8 @@ Compare app-calculated Amazon totals against QuickBooks and accountant numbers.
 
 import streamlit as st
 import pandas as pd
-from utils.sheets import get_spreadsheet
+from gspread.utils import absolute_range_name
+from utils.sheets import get_spreadsheet, get_worksheet, values_to_frame
 from utils.auth import require_auth
 
 st.set_page_config(
@@ -16,7 +17,8 @@ st.set_page_config(
 
 require_auth("business")
 
-RECON_SHEET = "📋 Tax Reconciliation 2025"
+RECON_SHEET  = "📋 Tax Reconciliation 2025"
+AMAZON_SHEET = "📊 Amazon 2025"
 
 # Metrics in order — must match the sheet rows exactly
 METRICS = [
@@ -30,17 +32,36 @@ METRICS = [
     "Net Profit",
 ]
 
+# Monthly breakdown columns → display names
+MONTHLY_COLS = {
+    "DateFrom":        "Month",
+    "SalesOrganic":    "Sales (Organic)",
+    "SalesPPC":        "Sales (PPC)",
+    "Refunds":         "Refunds",
+    "AmazonFees":      "Amazon Fees",
+    "EstimatedPayout": "Est. Payout",
+    "Cost of Goods":   "COGS",
+    "GrossProfit":     "Gross Profit",
+    "Expenses":        "Expenses",
+    "NetProfit":       "Net Profit",
+}
+
 
 # ─── Data loaders ─────────────────────────────────────────────────────────────
 
 @st.cache_data(ttl=300)
-def load_2025_totals() -> dict:
-    """Sum all 12 months from Amazon 2025 sheet."""
-    ws   = get_spreadsheet().worksheet("📊 Amazon 2025")
-    data = ws.get_all_records()
-    if not data:
-        return {}
-    df = pd.DataFrame(data)
+def load_2025_totals() -> tuple[dict, pd.DataFrame]:
+    """Sum all 12 months from Amazon 2025 sheet. Returns (totals, monthly breakdown frame)."""
+    # Unformatted values come back as numbers, so "1,234.56"-style display
+    # formatting never reaches the parser; dates stay readable strings
+    values = get_spreadsheet().values_get(
+        absolute_range_name(AMAZON_SHEET),
+        params={"valueRenderOption": "UNFORMATTED_VALUE",
+                "dateTimeRenderOption": "FORMATTED_STRING"},
+    ).get("values", [])
+    if len(values) < 2:
+        return {}, pd.DataFrame()
+    df = values_to_frame(values)
 
     def s(col):
         if col not in df.columns:
@@ -57,7 +78,7 @@ def load_2025_totals() -> dict:
     expenses           = s("Expenses")
     net_profit         = s("NetProfit")
 
-    return {
+    totals = {
         "Gross Revenue":       gross_revenue,
         "Refunds":             refund_cost,    # dollar impact (negative)
         "Amazon Fees":         amazon_fees,    # negative
@@ -67,29 +88,35 @@ def load_2025_totals() -> dict:
         "Operating Expenses":  expenses,
         "Net Profit":          net_profit,
     }
+    show = [c for c in MONTHLY_COLS if c in df.columns]
+    return totals, df[show].rename(columns=MONTHLY_COLS)
 
 
 @st.cache_data(ttl=60)
 def load_recon_data() -> dict:
     """Load saved QuickBooks + accountant numbers from the reconciliation sheet."""
-    ws   = get_spreadsheet().worksheet(RECON_SHEET)
+    ws   = get_worksheet(RECON_SHEET)
     data = ws.get_all_records()
-    result = {}
-    for row in data:
-        metric = str(row.get("Metric", "")).strip()
-        if not metric:
-            continue
-        try:
-            qb   = float(str(row.get("QuickBooks",       "") or "").replace(",", "") or 0)
-        except (ValueError, TypeError):
-            qb = 0.0
-        try:
-            acct = float(str(row.get("Accountant Final", "") or "").replace(",", "") or 0)
-        except (ValueError, TypeError):
-            acct = 0.0
-        notes = str(row.get("Notes", "") or "")
-        result[metric] = {"qb": qb, "acct": acct, "notes": notes}
-    return result
+    if not data:
+        return {}
+    df = pd.DataFrame(data).reindex(
+        columns=["Metric", "QuickBooks", "Accountant Final", "Notes"], fill_value=""
+    )
+
+    def _num(col):
+        raw = df[col].astype(str).str.replace(",", "", regex=False)
+        return pd.to_numeric(raw, errors="coerce").fillna(0.0)
+
+    df["Metric"] = df["Metric"].astype(str).str.strip()
+    df["qb"]     = _num("QuickBooks")
+    df["acct"]   = _num("Accountant Final")
+    df["notes"]  = df["Notes"].where(df["Notes"].astype(bool), "").astype(str)
+    return (
+        df[df["Metric"] != ""]
+        .drop_duplicates("Metric", keep="last")
+        .set_index("Metric")[["qb", "acct", "notes"]]
+        .to_dict("index")
+    )
 
 
 # ─── Page ─────────────────────────────────────────────────────────────────────
@@ -100,7 +127,7 @@ st.caption(
     "When all three columns match, you can trust this system for 2026."
 )
 
-totals = load_2025_totals()
+totals, monthly_df = load_2025_totals()
 recon  = load_recon_data()
 
 st.divider()
@@ -203,26 +230,8 @@ st.divider()
 # ─── Monthly breakdown (read-only) ────────────────────────────────────────────
 
 with st.expander("📅 Monthly breakdown (2025)"):
-    if totals:
-        ws   = get_spreadsheet().worksheet("📊 Amazon 2025")
-        data = ws.get_all_records()
-        if data:
-            mdf = pd.DataFrame(data)
-            show = ["DateFrom", "SalesOrganic", "SalesPPC", "Refunds",
-                    "AmazonFees", "EstimatedPayout", "Cost of Goods",
-                    "GrossProfit", "Expenses", "NetProfit"]
-            show = [c for c in show if c in mdf.columns]
-            mdf  = mdf[show].rename(columns={
-                "DateFrom":       "Month",
-                "SalesOrganic":   "Sales (Organic)",
-                "SalesPPC":       "Sales (PPC)",
-                "AmazonFees":     "Amazon Fees",
-                "EstimatedPayout":"Est. Payout",
-                "Cost of Goods":  "COGS",
-                "GrossProfit":    "Gross Profit",
-                "NetProfit":      "Net Profit",
-            })
-            st.dataframe(mdf, use_container_width=True, hide_index=True)
+    if totals and not monthly_df.empty:
+        st.dataframe(monthly_df, use_container_width=True, hide_index=True)
 
 st.divider()
 
@@ -234,34 +243,38 @@ st.caption("Fill these in when you have your bookkeeper's QuickBooks totals or a
 with st.form("recon_form"):
     st.markdown("**Enter dollar amounts — use negatives for fees/costs (e.g. -8,269 for Amazon Fees)**")
 
-    col_a, col_b = st.columns(2)
-
-    qb_inputs   = {}
-    acct_inputs = {}
-    note_inputs = {}
-
-    for i, metric in enumerate(METRICS):
-        existing = recon.get(metric, {})
-        col = col_a if i % 2 == 0 else col_b
-        with col:
-            st.markdown(f"**{metric}**")
-            sub1, sub2, sub3 = st.columns([2, 2, 3])
-            qb_inputs[metric]   = sub1.number_input("QuickBooks",       value=float(existing.get("qb",   0)), key=f"qb_{metric}",   label_visibility="collapsed", format="%.2f")
-            acct_inputs[metric] = sub2.number_input("Accountant Final", value=float(existing.get("acct", 0)), key=f"ac_{metric}",   label_visibility="collapsed", format="%.2f")
-            note_inputs[metric] = sub3.text_input(  "Notes",            value=str(existing.get("notes", "")), key=f"nt_{metric}",   label_visibility="collapsed", placeholder="Notes")
+    editor_df = pd.DataFrame({
+        "Metric":           METRICS,
+        "QuickBooks":       [float(recon.get(m, {}).get("qb",   0)) for m in METRICS],
+        "Accountant Final": [float(recon.get(m, {}).get("acct", 0)) for m in METRICS],
+        "Notes":            [str(recon.get(m, {}).get("notes", "")) for m in METRICS],
+    })
+    edited = st.data_editor(
+        editor_df,
+        key="recon_editor",
+        num_rows="fixed",
+        disabled=["Metric"],
+        hide_index=True,
+        use_container_width=True,
+        column_config={
+            "QuickBooks":       st.column_config.NumberColumn("QuickBooks",       format="%.2f"),
+            "Accountant Final": st.column_config.NumberColumn("Accountant Final", format="%.2f"),
+            "Notes":            st.column_config.TextColumn("Notes", width="large"),
+        },
+    )
 
     if st.form_submit_button("💾 Save Numbers", type="primary"):
-        ws = get_spreadsheet().worksheet(RECON_SHEET)
-        # Build update rows (skip header, rows 2-9)
-        update_data = []
-        for metric in METRICS:
-            update_data.append([
-                metric,
-                qb_inputs[metric],
-                acct_inputs[metric],
-                note_inputs[metric],
-            ])
-        ws.update("A2", update_data)
-        st.success("Saved! Refresh the page to see updated variances.")
-        st.cache_data.clear()
-        st.rerun()
+        # Rows 2-9, in METRICS order (header stays in row 1); cleared cells save as 0 / ""
+        update_data = (
+            edited.fillna({"QuickBooks": 0.0, "Accountant Final": 0.0, "Notes": ""})
+            [["Metric", "QuickBooks", "Accountant Final", "Notes"]]
+            .values.tolist()
+        )
+        try:
+            get_worksheet(RECON_SHEET).update("A2", update_data)
+            st.success("Saved! Refresh the page to see updated variances.")
+            load_recon_data.clear()
+            st.rerun()
+        except Exception as e:
+            get_worksheet.clear()     # drop a stale handle (tab renamed/recreated, expired session) before the retry
+            st.error(f"Failed to save: {e}")
@@ -3,11 +3,12 @@ Payout Register
 Log actual Amazon disbursements and compare to estimated payout from Finance API.
 """
 
+import numpy as np
 import streamlit as st
 import pandas as pd
 from datetime import datetime, timedelta
 from zoneinfo import ZoneInfo
-from utils.sheets import get_spreadsheet
+from utils.sheets import get_worksheet, get_revision_id
 from utils.auth import require_auth
 
 st.set_page_config(
@@ -27,7 +28,7 @@ AMAZON_SHEET  = "📊 Amazon 2026"
 
 @st.cache_data(ttl=120)
 def load_payouts() -> pd.DataFrame:
-    ws   = get_spreadsheet().worksheet(PAYOUT_SHEET)
+    ws   = get_worksheet(PAYOUT_SHEET)
     data = ws.get_all_records()
     if not data:
         return pd.DataFrame(columns=[
@@ -43,16 +44,19 @@ def load_payouts() -> pd.DataFrame:
 
 
 @st.cache_data(ttl=300)
-def load_amazon_daily() -> pd.DataFrame:
-    ws   = get_spreadsheet().worksheet(AMAZON_SHEET)
+def _load_amazon_arrays() -> tuple[np.ndarray, np.ndarray]:
+    """Amazon 2026 daily (dates, EstimatedPayout) as datetime64[ns] / float64 arrays sorted by date."""
+    ws   = get_worksheet(AMAZON_SHEET)
     data = ws.get_all_records()
     if not data:
-        return pd.DataFrame()
-    df = pd.DataFrame(data)
-    df["Date"] = pd.to_datetime(df["Date"], format="%d/%m/%Y", errors="coerce")
-    df = df.dropna(subset=["Date"]).sort_values("Date")
-    df["EstimatedPayout"] = pd.to_numeric(df["EstimatedPayout"], errors="coerce").fillna(0)
-    return df
+        return np.array([], dtype="datetime64[ns]"), np.array([], dtype="float64")
+    df    = pd.DataFrame(data)
+    dates = pd.to_datetime(df["Date"], format="%d/%m/%Y", errors="coerce")
+    keep  = dates.notna().to_numpy()
+    dates = dates.to_numpy()[keep]
+    pay   = pd.to_numeric(df["EstimatedPayout"], errors="coerce").fillna(0).to_numpy("float64")[keep]
+    order = np.argsort(dates, kind="stable")
+    return dates[order], pay[order]
 
 
 # ─── Page ─────────────────────────────────────────────────────────────────────
@@ -66,12 +70,12 @@ with col_r:
         st.cache_data.clear()
         st.rerun()
 
-payouts    = load_payouts()
-amazon_df  = load_amazon_daily()
+payouts                      = load_payouts()
+amazon_dates, amazon_payouts = _load_amazon_arrays()
 
 # ─── Summary metrics ──────────────────────────────────────────────────────────
 
-ytd_estimated = float(amazon_df["EstimatedPayout"].sum()) if not amazon_df.empty else 0.0
+ytd_estimated = float(amazon_payouts.sum())
 ytd_received  = float(payouts["Amount Received ($)"].sum()) if not payouts.empty else 0.0
 ytd_variance  = ytd_received - ytd_estimated
 payout_count  = len(payouts[payouts["Amount Received ($)"] > 0]) if not payouts.empty else 0
@@ -124,12 +128,11 @@ with st.form("payout_form"):
 
     if submitted:
         # Calculate expected from Amazon daily data for the period
-        if not amazon_df.empty:
-            mask = (
-                (amazon_df["Date"].dt.date >= period_start) &
-                (amazon_df["Date"].dt.date <= period_end)
-            )
-            expected = round(float(amazon_df.loc[mask, "EstimatedPayout"].sum()), 2)
+        if amazon_dates.size:
+            # Dates are sorted and midnight-only, so the period is one [lo, hi) slice
+            lo = np.searchsorted(amazon_dates, np.datetime64(period_start), side="left")
+            hi = np.searchsorted(amazon_dates, np.datetime64(period_end + timedelta(days=1)), side="left")
+            expected = round(float(amazon_payouts[lo:hi].sum()), 2)
         else:
             expected = 0.0
 
@@ -147,11 +150,16 @@ with st.form("payout_form"):
             notes,
         ]
 
-        ws = get_spreadsheet().worksheet(PAYOUT_SHEET)
-        ws.append_row(new_row, value_input_option="USER_ENTERED")
-        st.success(f"Saved! Expected ${expected:,.2f} · Received ${amount_received:,.2f} · Variance ${difference:,.2f}")
-        st.cache_data.clear()
-        st.rerun()
+        try:
+            get_worksheet(PAYOUT_SHEET).append_row(new_row, value_input_option="USER_ENTERED")
+            st.success(f"Saved! Expected ${expected:,.2f} · Received ${amount_received:,.2f} · Variance ${difference:,.2f}")
+            # Revision-keyed loaders (Reconciliation's register view) pick the new row up on their next run
+            load_payouts.clear()
+            get_revision_id.clear()
+            st.rerun()
+        except Exception as e:
+            get_worksheet.clear()     # drop a stale handle (tab renamed/recreated, expired session) before the retry
+            st.error(f"Failed to save: {e}")
 
 st.divider()
 
@@ -173,16 +181,15 @@ else:
     if len(payouts) > 1 and "Date Received" in payouts.columns:
         with st.expander("📅 Monthly rollup"):
             try:
-                p = payouts.copy()
-                p["Month"] = pd.to_datetime(p["Date Received"], errors="coerce").dt.strftime("%Y-%m")
-                rollup = p.groupby("Month").agg(
+                month  = pd.to_datetime(payouts["Date Received"], errors="coerce").dt.strftime("%Y-%m")
+                rollup = payouts.groupby(month.rename("Month")).agg(
                     Payouts=("Amount Received ($)", "count"),
                     Received=("Amount Received ($)", "sum"),
                     Expected=("Amount Expected ($)", "sum"),
                 ).reset_index()
                 rollup["Variance"] = rollup["Received"] - rollup["Expected"]
                 for col in ["Received", "Expected", "Variance"]:
-                    rollup[col] = rollup[col].apply(lambda x: f"${x:,.2f}")
+                    rollup[col] = rollup[col].map("${:,.2f}".format)
                 st.dataframe(rollup, use_container_width=True, hide_index=True)
             except Exception:
                 pass
@@ -13,7 +13,7 @@ import pandas as pd
 from datetime import datetime
 from zoneinfo import ZoneInfo
 from dotenv import load_dotenv
-from utils.sheets import get_spreadsheet
+from utils.sheets import get_worksheet
 from utils.book_lookup import lookup_isbn
 from utils.auth import require_auth
 
@@ -103,7 +103,7 @@ def get_used_buy_box(asin: str) -> float | None:
 @st.cache_data(ttl=60, show_spinner=False)
 def get_existing_batches() -> list[str]:
     try:
-        data = get_spreadsheet().worksheet("📦 Book Inventory").get_all_records()
+        data = get_worksheet("📦 Book Inventory").get_all_records()
         return sorted(
             {str(r.get("Batch", "")).strip() for r in data if r.get("Batch")},
             reverse=True,
@@ -115,7 +115,7 @@ def get_existing_batches() -> list[str]:
 @st.cache_data(ttl=30, show_spinner=False)
 def get_batch_book_count(batch_name: str) -> int:
     try:
-        data = get_spreadsheet().worksheet("📦 Book Inventory").get_all_records()
+        data = get_worksheet("📦 Book Inventory").get_all_records()
         return sum(1 for r in data if str(r.get("Batch", "")).strip() == batch_name)
     except Exception:
         return 0
@@ -124,7 +124,7 @@ def get_batch_book_count(batch_name: str) -> int:
 def save_book(book: dict, condition: str, price: float, cost: float,
               batch_name: str, sku_prefix: str, seq: int) -> str:
     sku = f"{sku_prefix}-{seq:03d}"
-    get_spreadsheet().worksheet("📦 Book Inventory").append_row([
+    get_worksheet("📦 Book Inventory").append_row([
         book["isbn"],
         book.get("asin", ""),
         book["title"],
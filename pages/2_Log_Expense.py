@@ -6,7 +6,7 @@ GST auto-calculates at 5% — override if different.
 
 import streamlit as st
 from datetime import date
-from utils.sheets import get_spreadsheet
+from utils.sheets import get_worksheet
 from utils.auth import require_auth
 
 st.set_page_config(
@@ -60,7 +60,7 @@ ZERO_GST_CATEGORIES = {
 def log_expense(expense_date: str, vendor: str, category: str,
                 pretax: float, gst: float, method: str,
                 hubdoc: str, notes: str) -> None:
-    ws = get_spreadsheet().worksheet("📒 Business Transactions")
+    ws = get_worksheet("📒 Business Transactions")
     # Find the first empty row in column A after the 3 header rows
     # (append_row is not used because reference list columns confuse the
     #  Sheets API table-detection, causing data to land in the wrong columns)
@@ -5,7 +5,7 @@ Visual breakdown of income vs expenses by month, pulled from Monthly Cashflow sh
 
 import streamlit as st
 import pandas as pd
-from utils.sheets import get_spreadsheet
+from utils.sheets import get_worksheet
 from utils.auth import require_auth
 
 st.set_page_config(
@@ -19,7 +19,7 @@ require_auth("business")
 
 @st.cache_data(ttl=300)
 def load_cashflow() -> pd.DataFrame:
-    ws = get_spreadsheet().worksheet("📊 Monthly Cashflow")
+    ws = get_worksheet("📊 Monthly Cashflow")
     data = ws.get_all_values()
     if len(data) < 3:
         return pd.DataFrame()
@@ -5,7 +5,7 @@ Annual ITC tracker and CRA filing prep — pulled live from GST Annual Summary s
 
 import streamlit as st
 import pandas as pd
-from utils.sheets import get_spreadsheet
+from utils.sheets import get_worksheet
 from utils.auth import require_auth
 
 st.set_page_config(
@@ -19,7 +19,7 @@ require_auth("business")
 
 @st.cache_data(ttl=300)
 def load_gst_data() -> dict:
-    ws = get_spreadsheet().worksheet("🇨🇦 GST Annual Summary")
+    ws = get_worksheet("🇨🇦 GST Annual Summary")
     data = ws.get_all_values()
 
     result = {
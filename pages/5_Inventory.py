@@ -7,7 +7,7 @@ Book investment tracked at the pallet level (not per-book).
 import streamlit as st
 import pandas as pd
 from datetime import date
-from utils.sheets import get_spreadsheet
+from utils.sheets import get_worksheet
 from utils.auth import require_auth
 
 st.set_page_config(
@@ -27,7 +27,7 @@ STATUSES = ["All", "Unlisted", "Listed", "Sold"]
 def load_sellerboard_snapshot() -> dict:
     """FBA units + potential sales/profit from the SP-API inventory snapshot."""
     try:
-        ws   = get_spreadsheet().worksheet("📦 Inventory Snapshot")
+        ws   = get_worksheet("📦 Inventory Snapshot")
         rows = ws.get_all_records()
         if not rows:
             return {}
@@ -51,7 +51,7 @@ def load_pallet_data() -> dict:
     Total may be blank — compute as #Pallets × Price when missing.
     """
     try:
-        ws   = get_spreadsheet().worksheet("📦 Colin - Pallet Sales")
+        ws   = get_worksheet("📦 Colin - Pallet Sales")
         rows = ws.get_all_values()
         # row index 0 = title "Book Pallet Sales", index 1 = headers, index 2+ = data
         data_rows = rows[2:] if len(rows) > 2 else []
@@ -94,7 +94,7 @@ def load_pallet_data() -> dict:
 def load_book_sales_ytd() -> float:
     """Sum SalesOrganic (col B) from the Amazon 2026 sheet — all 2026 sales."""
     try:
-        ws   = get_spreadsheet().worksheet("📊 Amazon 2026")
+        ws   = get_worksheet("📊 Amazon 2026")
         vals = ws.get_all_values()
         total = 0.0
         for row in vals[1:]:   # skip header
@@ -110,7 +110,7 @@ def load_book_sales_ytd() -> float:
 
 @st.cache_data(ttl=60)
 def load_inventory() -> pd.DataFrame:
-    ws   = get_spreadsheet().worksheet("📦 Book Inventory")
+    ws   = get_worksheet("📦 Book Inventory")
     data = ws.get_all_records()
     if not data:
         return pd.DataFrame()
@@ -171,7 +171,7 @@ with st.expander("➕ Log new pallet purchase"):
         p_price  = fc3.number_input("$ per pallet", min_value=0.0, step=1.0, value=86.0)
         if st.form_submit_button("Save Pallet Purchase", type="primary"):
             total_val = p_count * p_price
-            ws = get_spreadsheet().worksheet("📦 Colin - Pallet Sales")
+            ws = get_worksheet("📦 Colin - Pallet Sales")
             ws.append_row([p_date, p_count, p_price, total_val, 0, total_val])
             st.success(f"Logged {p_count} pallet(s) × ${p_price:.2f} = ${total_val:.2f} for {p_date}")
             st.cache_data.clear()
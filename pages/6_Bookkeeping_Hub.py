@@ -6,7 +6,7 @@ Pulls from Business Transactions, Monthly P&L, and GST Annual Summary sheets.
 import streamlit as st
 import pandas as pd
 from datetime import date, datetime
-from utils.sheets import get_spreadsheet
+from utils.sheets import get_worksheet
 from utils.auth import require_auth
 
 st.set_page_config(
@@ -46,7 +46,7 @@ MONTH_LABELS = {
 @st.cache_data(ttl=60)
 def load_transactions() -> list[dict]:
     try:
-        ws       = get_spreadsheet().worksheet("📒 Business Transactions")
+        ws       = get_worksheet("📒 Business Transactions")
         all_vals = ws.get_all_values()
     except Exception:
         return []
@@ -96,7 +96,7 @@ def load_monthly_pl() -> dict:
     Finds the real header by locating the row where col A == 'Month'.
     """
     try:
-        ws   = get_spreadsheet().worksheet("📊 Monthly P&L")
+        ws   = get_worksheet("📊 Monthly P&L")
         rows = ws.get_all_values()
     except Exception:
         return {}
@@ -10,7 +10,7 @@ import pandas as pd
 import calendar
 from datetime import date, datetime
 from zoneinfo import ZoneInfo
-from utils.sheets import get_spreadsheet
+from utils.sheets import get_worksheet
 from utils.auth import require_auth
 
 st.set_page_config(
@@ -150,7 +150,7 @@ def load_bt_all() -> list[dict]:
       Row 4+ — Data rows      ← all_vals[3:]  (sheet row 4 = _sheet_row 4)
     """
     try:
-        ws       = get_spreadsheet().worksheet("📒 Business Transactions")
+        ws       = get_worksheet("📒 Business Transactions")
         all_vals = ws.get_all_values()
     except Exception as e:
         st.error(f"Could not load Business Transactions sheet: {e}")
@@ -202,7 +202,7 @@ def load_bt_all() -> list[dict]:
 def load_amazon_months() -> dict[str, list[dict]]:
     """Load Amazon 2026 grouped by YYYY-MM."""
     try:
-        ws       = get_spreadsheet().worksheet("📊 Amazon 2026")
+        ws       = get_worksheet("📊 Amazon 2026")
         all_vals = ws.get_all_values()
     except Exception as e:
         st.error(f"Could not load Amazon 2026 sheet: {e}")
@@ -242,7 +242,7 @@ def load_amazon_months() -> dict[str, list[dict]]:
 # ─── Write helpers ────────────────────────────────────────────────────────────
 
 def _bt_ws():
-    return get_spreadsheet().worksheet("📒 Business Transactions")
+    return get_worksheet("📒 Business Transactions")
 
 
 def _find_next_bt_row(ws, n: int = 1) -> int:
@@ -375,7 +375,7 @@ def apply_to_amazon(month_total: float, amz_rows: list[dict]) -> tuple[int, int]
             batch.append({"range": f"Z{r}", "values": [[round(entry["Payout"], 2)]]})
 
     if batch:
-        ws = get_spreadsheet().worksheet("📊 Amazon 2026")
+        ws = get_worksheet("📊 Amazon 2026")
         ws.batch_update(batch, value_input_option="USER_ENTERED")
 
     return num_days, gross_fixes
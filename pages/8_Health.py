@@ -10,7 +10,7 @@ import pandas as pd
 import calendar
 from datetime import date, datetime
 from io import StringIO
-from utils.sheets import get_spreadsheet
+from utils.sheets import get_spreadsheet, get_worksheet
 from utils.auth import require_auth
 from utils.alerts import check_sleep_alert, alerts_configured
 
@@ -92,7 +92,7 @@ def _ws(name: str):
     """Get or create a worksheet, adding header row if brand new."""
     ss = get_spreadsheet()
     try:
-        return ss.worksheet(name)
+        return get_worksheet(name)
     except Exception:
         ws = ss.add_worksheet(title=name, rows=1000, cols=len(HEADERS[name]) + 2)
         ws.append_row(HEADERS[name])
@@ -103,7 +103,7 @@ def _ws(name: str):
 def load_health(ws_name: str) -> list[dict]:
     """Load all records from a health sheet; returns [] if sheet not created yet."""
     try:
-        ws      = get_spreadsheet().worksheet(ws_name)
+        ws      = get_worksheet(ws_name)
         records = ws.get_all_records()
         for i, r in enumerate(records, start=2):
             r["_row"] = i
@@ -27,7 +27,7 @@ from pathlib import Path
 from email.mime.text import MIMEText
 from email.mime.multipart import MIMEMultipart
 from datetime import datetime, timedelta
-from utils.sheets import get_spreadsheet
+from utils.sheets import get_spreadsheet, get_worksheet
 try:
     import extra_streamlit_components as stx
     _COOKIES_AVAILABLE = True
@@ -49,6 +49,16 @@ ROLE_ADMIN    = "admin"
 ROLE_BUSINESS = "business"
 ROLE_PERSONAL = "personal"
 
+# Roles admitted to each section, and the message shown to everyone else
+_LEVEL_ROLES = {
+    "business": frozenset({ROLE_BUSINESS, ROLE_ADMIN}),
+    "personal": frozenset({ROLE_PERSONAL, ROLE_ADMIN}),
+}
+_LEVEL_DENIED = {
+    "business": "🔒 This section requires a business account. Contact Colin to upgrade your access.",
+    "personal": "🔒 This section requires a Health account. Contact Colin to get access.",
+}
+
 _SK_USER    = "_auth_username"
 _SK_NAME    = "_auth_name"
 _SK_ROLE    = "_auth_role"
@@ -135,7 +145,7 @@ def _clear_local_session() -> None:
 def _users_ws():
     ss = get_spreadsheet()
     try:
-        return ss.worksheet(USERS_SHEET)
+        return get_worksheet(USERS_SHEET)
     except Exception:
         ws = ss.add_worksheet(title=USERS_SHEET, rows=200, cols=len(USERS_HEADERS))
         ws.append_row(USERS_HEADERS)
@@ -143,10 +153,15 @@ def _users_ws():
 
 
 def _load_users() -> list[dict]:
+    """User rows as dicts of raw cell strings — get_all_values, no numericising."""
     try:
-        return _users_ws().get_all_records()
+        values = _users_ws().get_all_values()
     except Exception:
         return []
+    if not values:
+        return []
+    header = [h.strip() for h in values[0]]
+    return [dict(zip(header, r + [""] * (len(header) - len(r)))) for r in values[1:]]
 
 
 def _append_user(username, name, email, pw_hash, role, verified, token, created):
@@ -173,7 +188,7 @@ def _log_event(username: str, name: str, role: str, action: str):
     try:
         ss = get_spreadsheet()
         try:
-            ws = ss.worksheet(LOG_SHEET)
+            ws = get_worksheet(LOG_SHEET)
         except Exception:
             ws = ss.add_worksheet(title=LOG_SHEET, rows=2000, cols=len(LOG_HEADERS))
             ws.append_row(LOG_HEADERS)
@@ -440,11 +455,8 @@ def require_auth(level: str = "business"):
     if username and role:
         # Refresh expiry on each active page load
         st.session_state[_SK_EXPIRES] = datetime.now() + timedelta(hours=_SESSION_HOURS)
-        if level == "business" and role not in (ROLE_BUSINESS, ROLE_ADMIN):
-            st.error("🔒 This section requires a business account. Contact Colin to upgrade your access.")
-            st.stop()
-        if level == "personal" and role not in (ROLE_PERSONAL, ROLE_ADMIN):
-            st.error("🔒 This section requires a Health account. Contact Colin to get access.")
+        if level in _LEVEL_ROLES and role not in _LEVEL_ROLES[level]:
+            st.error(_LEVEL_DENIED[level])
             st.stop()
         # Health section always requires the separate health password, even for admins
         if level == "personal" and not st.session_state.get(_SK_HEALTH):
@@ -0,0 +1,64 @@
+"""
+On-disk Parquet cache for parsed sheet data.
+Survives Streamlit worker restarts that wipe st.cache_data / st.cache_resource,
+so a cold session reads a local file instead of waiting on the Sheets API.
+Freshness is the file's mtime — anything older than the TTL is ignored — and,
+optionally, a tag (e.g. the spreadsheet revision) baked into the file name.
+Files live in a per-user cache directory (mode 0700), not the shared tempdir.
+"""
+
+import hashlib
+import os
+import time
+from pathlib import Path
+
+import pandas as pd
+
+CACHE_DIR = Path(os.environ.get("XDG_CACHE_HOME") or Path.home() / ".cache") / "loeppky"
+
+
+def _path(name: str, tag: str = "") -> Path:
+    if not tag:
+        return CACHE_DIR / f"{name}.parquet"
+    return CACHE_DIR / f"{name}-{hashlib.sha1(tag.encode()).hexdigest()[:12]}.parquet"
+
+
+def read_frame(name: str, ttl: int | None = 300, tag: str = "") -> pd.DataFrame | None:
+    """
+    Return the cached frame if it exists for this tag and was written less than
+    ttl seconds ago (ttl=None → any age), else None.
+    """
+    path = _path(name, tag)
+    try:
+        if ttl is None or time.time() - path.stat().st_mtime < ttl:
+            return pd.read_parquet(path)
+    except Exception:
+        pass
+    return None
+
+
+def write_frame(name: str, df: pd.DataFrame, tag: str = "") -> None:
+    """
+    Atomically write df to the cache, replacing copies stored under older tags.
+    Failures are ignored — the cache is best-effort.
+    """
+    path = _path(name, tag)
+    try:
+        CACHE_DIR.mkdir(mode=0o700, parents=True, exist_ok=True)
+        CACHE_DIR.chmod(0o700)   # mkdir's mode is ignored when the directory already exists
+        for old in CACHE_DIR.glob(f"{name}-*.parquet"):
+            old.unlink(missing_ok=True)
+        tmp = path.with_suffix(".tmp")
+        df.to_parquet(tmp)
+        os.replace(tmp, path)
+    except Exception:
+        pass
+
+
+def clear_frames() -> None:
+    """Delete every cached frame (used by the Refresh buttons)."""
+    try:
+        for path in CACHE_DIR.glob("*.parquet"):
+            path.unlink(missing_ok=True)
+    except Exception:
+        pass
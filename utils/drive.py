@@ -9,6 +9,7 @@ import io
 import json
 import os
 import re
+from functools import lru_cache
 
 import streamlit as st
 from google.oauth2.service_account import Credentials
@@ -20,6 +21,8 @@ _DRIVE_SCOPES = [
     "https://www.googleapis.com/auth/drive",
 ]
 
+_FILE_ID_RE = re.compile(r"/d/([\w-]+)")
+
 
 def _get_creds() -> Credentials:
     """Return service account credentials with Drive scope."""
@@ -85,9 +88,10 @@ def upload_receipt(file_bytes: bytes, filename: str, mime_type: str) -> tuple[st
     return view_url, file_id
 
 
+@lru_cache(maxsize=512)
 def file_id_from_url(drive_url: str) -> str:
     """Extract the Google Drive file ID from a /file/d/FILE_ID/view URL."""
-    m = re.search(r"/d/([\w-]+)", drive_url)
+    m = _FILE_ID_RE.search(drive_url)
     return m.group(1) if m else ""
 
 
@@ -4,10 +4,16 @@ Cached as a resource so the connection is reused across reruns.
 """
 
 import os
+from typing import TYPE_CHECKING
+
 import gspread
 import streamlit as st
+from gspread.utils import absolute_range_name
 from google.oauth2.service_account import Credentials
 
+if TYPE_CHECKING:
+    import pandas as pd
+
 SPREADSHEET_ID = "1arXxho2gD8IeWbQNcOt8IwZ7DRl2wz-qJzC3J4hiR4k"
 SCOPES = [
     "https://spreadsheets.google.com/feeds",
@@ -17,7 +23,7 @@ SCOPES = [
 
 @st.cache_resource
 def get_spreadsheet():
-    """Returns authenticated gspread Spreadsheet. Cached for the session lifetime."""
+    """Returns authenticated gspread Spreadsheet. Cached once per process and shared by every page and session."""
     # Cloud deployment: read from Streamlit secrets
     try:
         creds_info = dict(st.secrets["gcp_service_account"])
@@ -32,3 +38,60 @@ def get_spreadsheet():
 
     gc = gspread.authorize(creds)
     return gc.open_by_key(SPREADSHEET_ID)
+
+
+@st.cache_resource
+def get_worksheet(title: str) -> gspread.Worksheet:
+    """
+    Worksheet handle for a tab, keyed by title and shared by every page.
+    The tab lookup (a metadata fetch) is paid once per process; a missing tab
+    raises WorksheetNotFound and is not cached, so pages can create it and retry.
+    """
+    return get_spreadsheet().worksheet(title)
+
+
+@st.cache_data(ttl=30)
+def get_revision_id() -> str:
+    """
+    Drive modifiedTime of the spreadsheet — changes on any edit, so loaders can
+    key their caches on it and skip re-parsing when nothing changed.
+    One metadata request, re-checked at most every 30s. Returns "" on failure.
+    """
+    try:
+        return str(get_spreadsheet().get_lastUpdateTime())
+    except Exception:
+        return ""
+
+
+def _a1(range_name: str) -> str:
+    """Quote a tab name (or 'Tab!A1:B2' range) for the values API — tab names contain emoji/spaces."""
+    if "!" in range_name:
+        sheet, cells = range_name.split("!", 1)
+        return absolute_range_name(sheet.strip("'"), cells)
+    return absolute_range_name(range_name)
+
+
+def get_sheets_batch(ranges: list[str]) -> list[list[list[str]]]:
+    """
+    Fetch several tabs/ranges in a single values.batchGet round-trip.
+    Returns one 2D list of cell strings per requested range, in order.
+    """
+    resp = get_spreadsheet().values_batch_get([_a1(r) for r in ranges])
+    return [vr.get("values", []) for vr in resp.get("valueRanges", [])]
+
+
+def values_to_frame(values: list[list[str]]) -> "pd.DataFrame":
+    """
+    Build a DataFrame straight from a raw values list (header row first) —
+    no per-row dict construction. The API drops trailing blank cells, so
+    short rows are padded with "" and over-long rows trimmed to the header.
+    Header names are stripped of stray whitespace.
+    """
+    import pandas as pd  # deferred: utils.auth imports this module for the login page
+
+    if not values:
+        return pd.DataFrame()
+    header = [str(h).strip() for h in values[0]]
+    width  = len(header)
+    rows   = [r[:width] for r in values[1:]]
+    return pd.DataFrame(rows, columns=header).fillna("")